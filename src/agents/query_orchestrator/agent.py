@@ -8,13 +8,6 @@ This orchestrator delegates to specialized agents (all at same directory level):
 - query_metrics: Specific numeric metrics (TODO)
 """
 import logging
-import sys
-from pathlib import Path
-
-# Add parent directories to path
-src_path = Path(__file__).parent.parent.parent
-if str(src_path) not in sys.path:
-    sys.path.insert(0, str(src_path))
 
 from google.adk.agents import LlmAgent
 from google.adk.models.google_llm import Gemini
@@ -1,18 +1,12 @@
 """Trends Agent - Quality trend analysis expert."""
 import logging
-import sys
-from pathlib import Path
-
-# Add parent directories to path
-src_path = Path(__file__).parent.parent.parent.parent
-if str(src_path) not in sys.path:
-    sys.path.insert(0, str(src_path))
 
 from google.adk.agents import LlmAgent
 from google.adk.models.google_llm import Gemini
 from google.genai import types
 from tools.query_tools import query_trends
 from tools.query_tools_v2 import filter_commits, get_commit_details, aggregate_file_metrics
+from agents.query_trends.response_cache import after_model_cache, before_model_cache
 
 logger = logging.getLogger(__name__)
 
@@ -183,7 +177,9 @@ root_agent = LlmAgent(
     This is +2.5 points improvement. There were some issues in middle but got better.
     Authors made changes. Overall positive. Keep up good work..."
     """,
-    tools=[query_trends, filter_commits, get_commit_details, aggregate_file_metrics]
+    tools=[query_trends, filter_commits, get_commit_details, aggregate_file_metrics],
+    before_model_callback=before_model_cache,
+    after_model_callback=after_model_cache,
 )
 
 logger.debug("Trends agent initialized")
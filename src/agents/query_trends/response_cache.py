@@ -0,0 +1,81 @@
+"""Response cache for the trends agent's LLM calls.
+
+Dashboards ask the same trend questions many times a day. The trends agent
+runs with these model callbacks so a repeated request (same conversation
+contents, same day) is answered from memory without calling Gemini.
+
+The key covers the full LLM request, including tool responses. A repeated
+question re-runs the cheap Firestore tools and only reuses the narrative
+when the underlying data is unchanged. The day bucket keeps relative
+phrases like "last 2 weeks" from being served stale across midnight.
+"""
+import hashlib
+import logging
+import threading
+import time
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL_SECONDS = 3600
+CACHE_MAX_ENTRIES = 512
+
+# temp: state is scoped to one invocation and never persisted
+_STATE_KEY = "temp:trends_response_cache_key"
+
+_cache: Dict[str, Tuple[float, LlmResponse]] = {}
+_lock = threading.Lock()
+
+
+def _request_key(llm_request: LlmRequest) -> str:
+    """Build cache key from normalized request contents + model + day bucket."""
+    parts = [llm_request.model or "", date.today().isoformat()]
+    for content in llm_request.contents:
+        parts.append(content.model_dump_json(exclude_none=True))
+    normalized = " ".join("\n".join(parts).lower().split())
+    return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+
+def before_model_cache(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """Return cached response for an identical request, skipping the LLM call."""
+    key = _request_key(llm_request)
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(key)
+        if entry and now - entry[0] < CACHE_TTL_SECONDS:
+            logger.debug(f"Trends response cache hit: {key[:8]}")
+            callback_context.state[_STATE_KEY] = None
+            return entry[1]
+        if entry:
+            del _cache[key]
+
+    callback_context.state[_STATE_KEY] = key
+    return None
+
+
+def after_model_cache(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> Optional[LlmResponse]:
+    """Store completed (non-partial, non-error) responses for reuse."""
+    key = callback_context.state.get(_STATE_KEY)
+    if not key or llm_response.partial or llm_response.error_code:
+        return None
+
+    with _lock:
+        if len(_cache) >= CACHE_MAX_ENTRIES:
+            # Evict oldest entry (dicts keep insertion order)
+            _cache.pop(next(iter(_cache)))
+        _cache[key] = (time.monotonic(), llm_response)
+    return None
+
+
+def clear_cache() -> None:
+    """Drop all cached responses."""
+    with _lock:
+        _cache.clear()
@@ -1,15 +1,58 @@
 """Audit engine that analyzes complete repository state at a commit."""
 
+import hashlib
+import logging
+import multiprocessing
+import os
 import tempfile
+import time
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
 
 from audit_models import CommitAudit, FileAudit
 from connectors.base import CommitInfo, RepositoryConnector
 from lib.complexity_analyzer import calculate_complexity
 from lib.security_scanner import detect_security_issues
 
+logger = logging.getLogger(__name__)
+
+# Concurrent blob downloads when auditing through the connector API
+BLOB_FETCH_WORKERS = 8
+
+# Below this many files, per-file analysis runs in-process
+PARALLEL_MIN_FILES = 4
+
+# Analysis workers are never forked from the agent process: its gRPC and
+# requests threads may hold locks that a forked child would inherit locked
+POOL_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# Larger .py files are almost always generated (protobuf stubs, vendored
+# bundles); Bandit/radon cost grows faster than linearly with their size
+MAX_FILE_BYTES = 1024 * 1024
+
+# Security score penalty per issue, by severity
+SEVERITY_PENALTY = {"critical": 20.0, "high": 10.0, "medium": 5.0, "low": 1.0}
+
+# Bandit reports upper-case severities; map them to the canonical (interned
+# literal) strings instead of allocating a new .lower() string per issue
+_BANDIT_SEVERITY = {severity.upper(): severity for severity in SEVERITY_PENALTY}
+
+# Complexity above each threshold (exclusive) escalates the severity one step
+_COMPLEXITY_THRESHOLDS = (10, 15, 20)
+_COMPLEXITY_SEVERITIES = ("low", "medium", "high", "critical")
+
+
+def _complexity_severity(complexity: float) -> str:
+    """Map cyclomatic complexity to a severity label."""
+    return _COMPLEXITY_SEVERITIES[bisect_left(_COMPLEXITY_THRESHOLDS, complexity)]
+
 
 class AuditEngine:
     """Analyzes complete repository state at specific commits.
@@ -19,133 +62,581 @@ class AuditEngine:
     comprehensive quality metrics.
     """
 
+    # Exclude common non-source directories
+    EXCLUDE_DIRS = frozenset({
+        ".git",
+        "__pycache__",
+        "venv",
+        ".venv",
+        "env",
+        "node_modules",
+        ".tox",
+        "build",
+        "dist",
+        ".eggs",
+    })
+
     def __init__(
         self,
         connector: RepositoryConnector,
         temp_dir: Optional[str] = None,
+        use_blob_api: bool = False,
+        max_workers: Optional[int] = None,
+        cache_file_audits: bool = True,
+        max_file_bytes: Optional[int] = MAX_FILE_BYTES,
     ):
         """Initialize audit engine.
 
         Args:
             connector: Repository connector (GitHub, GitLab, etc.)
             temp_dir: Optional temporary directory for clones (default: system temp)
+            use_blob_api: Read files through the connector's tree/blob API instead
+                of cloning. Falls back to a clone if the API path fails.
+            max_workers: Processes for per-file analysis (default: CPU count,
+                1 disables the process pool)
+            cache_file_audits: Reuse per-file results for content already
+                audited by this engine (False re-analyzes every file)
+            max_file_bytes: Skip files larger than this (None audits all files)
         """
         self.connector = connector
         self.temp_dir = temp_dir or tempfile.gettempdir()
+        self.use_blob_api = use_blob_api
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Blob SHAs are content hashes, so (blob_sha, path) -> FileAudit never goes stale
+        self._blob_audit_cache: Dict[Tuple[str, str], FileAudit] = {}
+        # (content digest, path) -> FileAudit for cloned working trees
+        self.cache_file_audits = cache_file_audits
+        self._file_audit_cache: Dict[Tuple[str, str], FileAudit] = {}
+        self.max_file_bytes = max_file_bytes
 
     def audit_commit(
         self,
         repo_identifier: str,
         commit: CommitInfo,
+        work_dir: Optional[str] = None,
+        executor: Optional[Executor] = None,
     ) -> CommitAudit:
         """Audit repository state at a specific commit.
 
         Args:
             repo_identifier: Repository identifier (e.g., "owner/repo")
             commit: Commit information
+            work_dir: Reusable directory for the clone: cloned into on first
+                use, switched with checkout_commit afterwards (default: a
+                fresh temporary clone per call)
+            executor: Shared analysis pool (default: a pool per call)
 
         Returns:
             CommitAudit with security and complexity findings
         """
-        # Create temporary directory for this audit
-        with tempfile.TemporaryDirectory(dir=self.temp_dir) as clone_dir:
-            # Clone repository at specific commit
-            repo_path = self.connector.clone_repository(
-                repo_identifier, clone_dir, sha=commit.sha
+        started = time.perf_counter()
+        file_audits = None
+        if self.use_blob_api:
+            try:
+                file_audits = self._audit_files_via_api(repo_identifier, commit.sha)
+            except Exception as e:
+                logger.warning(
+                    f"Blob API audit failed for {repo_identifier}@{commit.sha[:7]}, "
+                    f"falling back to clone: {e}"
+                )
+
+        if file_audits is None:
+            file_audits = self._audit_files_via_clone(
+                repo_identifier, commit.sha, work_dir, executor
             )
 
-            # Find all Python files in repository
-            python_files = self._find_python_files(repo_path)
+        return self._build_commit_audit(repo_identifier, commit, file_audits, started)
+
+    def audit_commit_incremental(
+        self,
+        repo_identifier: str,
+        commit: CommitInfo,
+        previous: CommitAudit,
+        work_dir: Optional[str] = None,
+        executor: Optional[Executor] = None,
+    ) -> CommitAudit:
+        """Audit a commit by re-analyzing only files changed since its parent.
+
+        Per-file audits of the parent are carried forward for unchanged
+        files; changed and added files are analyzed, and deleted files drop
+        out. commit.files_changed is not trusted for this: it is empty for
+        commits listed without details and capped by GitHub for large
+        commits. Instead, the changed set comes from:
 
-            # Analyze each file separately (NEW: per-file audits)
-            file_audits = []
-            for py_file in python_files:
-                file_audit = self._audit_single_file(py_file, repo_path)
-                if file_audit:  # Skip files that failed to analyze
-                    file_audits.append(file_audit)
+        - the local clone in work_dir (git diff between the two commits),
+          which costs no API requests; or
+        - with use_blob_api, the connector's tree/blob API, reusing files
+          whose blob SHA is the same in both commit trees.
 
-            # Aggregate metrics from file audits
-            all_security_issues = []
-            all_complexity_issues = []
-            total_complexity = 0.0
-            max_complexity = 0.0
-            total_function_count = 0
-
-            for file_audit in file_audits:
-                all_security_issues.extend(file_audit.security_issues)
-                all_complexity_issues.extend(file_audit.complexity_issues)
-                total_complexity += file_audit.avg_complexity * file_audit.function_count
-                max_complexity = max(max_complexity, file_audit.max_complexity)
-                total_function_count += file_audit.function_count
-
-            # Calculate commit-level metrics
-            avg_complexity = (
-                total_complexity / total_function_count if total_function_count > 0 else 0.0
+        Falls back to a full audit_commit when previous is not the commit's
+        only parent, when there is no work_dir to diff in (clone mode), or
+        when the incremental path fails.
+
+        Args:
+            repo_identifier: Repository identifier (e.g., "owner/repo")
+            commit: Commit information (with parents)
+            previous: Audit of the commit's parent
+            work_dir: Reusable clone directory (required for the clone path)
+            executor: Shared analysis pool (default: a pool per call)
+
+        Returns:
+            CommitAudit with security and complexity findings
+        """
+        if commit.parents != [previous.commit_sha] or (
+            not self.use_blob_api and work_dir is None
+        ):
+            return self.audit_commit(repo_identifier, commit, work_dir, executor=executor)
+
+        started = time.perf_counter()
+        try:
+            if self.use_blob_api:
+                file_audits = self._audit_changed_files_via_api(
+                    repo_identifier, commit.sha, previous
+                )
+            else:
+                file_audits = self._audit_changed_files_via_clone(
+                    repo_identifier, commit.sha, previous, work_dir, executor
+                )
+        except Exception as e:
+            logger.warning(
+                f"Incremental audit failed for {repo_identifier}@{commit.sha[:7]}, "
+                f"running full audit: {e}"
             )
-            security_score = self._calculate_security_score(all_security_issues)
-            quality_score = self._calculate_quality_score(
-                security_score, avg_complexity, len(all_complexity_issues)
+            return self.audit_commit(repo_identifier, commit, work_dir, executor=executor)
+
+        return self._build_commit_audit(repo_identifier, commit, file_audits, started)
+
+    def audit_commits(
+        self,
+        repo_identifier: str,
+        commits: Sequence[CommitInfo],
+        previous: Optional[CommitAudit] = None,
+    ) -> Iterator[CommitAudit]:
+        """Audit commits oldest-first, incrementally where history allows.
+
+        Each commit whose parent was the previously audited commit is audited
+        with audit_commit_incremental; others get a full audit. Full audits
+        share one clone, checked out per commit, instead of cloning each
+        time, and one analysis process pool serves the whole run. Audits are
+        yielded as they complete so callers can persist them one by one.
+
+        Args:
+            repo_identifier: Repository identifier (e.g., "owner/repo")
+            commits: Commits to audit, in any order
+            previous: Existing audit to build on (e.g., last stored audit)
+
+        Yields:
+            CommitAudit per commit, in chronological order
+        """
+        pool = self._process_pool() if self.max_workers > 1 else nullcontext()
+        with pool as executor, tempfile.TemporaryDirectory(dir=self.temp_dir) as work_dir:
+            for commit in sorted(commits, key=lambda c: c.date):
+                if previous is not None:
+                    audit = self.audit_commit_incremental(
+                        repo_identifier, commit, previous, work_dir, executor=executor
+                    )
+                else:
+                    audit = self.audit_commit(
+                        repo_identifier, commit, work_dir, executor=executor
+                    )
+                yield audit
+                previous = audit
+
+    def _audit_files_via_clone(
+        self,
+        repo_identifier: str,
+        sha: str,
+        work_dir: Optional[str] = None,
+        executor: Optional[Executor] = None,
+    ) -> List[FileAudit]:
+        """Check out a commit locally and audit every Python file.
+
+        Args:
+            repo_identifier: Repository identifier (e.g., "owner/repo")
+            sha: Commit SHA to check out
+            work_dir: Reusable clone directory (default: temporary clone)
+            executor: Shared analysis pool (default: a pool per call)
+
+        Returns:
+            List of FileAudit objects
+        """
+        if work_dir is None:
+            # Create temporary directory for this audit
+            with tempfile.TemporaryDirectory(dir=self.temp_dir) as clone_dir:
+                repo_path = self.connector.clone_repository(repo_identifier, clone_dir, sha=sha)
+                return self._audit_files(
+                    self._find_python_files(repo_path), repo_path, executor
+                )
+
+        repo_path = self._checkout(repo_identifier, sha, work_dir)
+
+        # Analyze each file separately (NEW: per-file audits)
+        return self._audit_files(self._find_python_files(repo_path), repo_path, executor)
+
+    def _checkout(self, repo_identifier: str, sha: str, work_dir: str) -> str:
+        """Put a commit in work_dir, cloning on first use.
+
+        Args:
+            repo_identifier: Repository identifier (e.g., "owner/repo")
+            sha: Commit SHA to check out
+            work_dir: Reusable clone directory
+
+        Returns:
+            Path of the checked-out repository
+        """
+        if (Path(work_dir) / ".git").is_dir():
+            # Already cloned by an earlier audit: just switch commits
+            self.connector.checkout_commit(work_dir, sha)
+            return work_dir
+        # Clone repository at specific commit
+        return self.connector.clone_repository(repo_identifier, work_dir, sha=sha)
+
+    def _audit_changed_files_via_clone(
+        self,
+        repo_identifier: str,
+        sha: str,
+        previous: CommitAudit,
+        work_dir: str,
+        executor: Optional[Executor] = None,
+    ) -> List[FileAudit]:
+        """Audit a commit in the shared clone, reusing the parent's unchanged files.
+
+        Args:
+            repo_identifier: Repository identifier (e.g., "owner/repo")
+            sha: Commit SHA to check out
+            previous: Audit of the commit's parent
+            work_dir: Reusable clone directory
+            executor: Shared analysis pool (default: a pool per call)
+
+        Returns:
+            List of FileAudit objects, in walk order
+        """
+        repo_path = self._checkout(repo_identifier, sha, work_dir)
+        changed = {
+            str(Path(path))
+            for path in self.connector.changed_files(repo_path, previous.commit_sha, sha)
+        }
+        reuse = {
+            file_audit.file_path: file_audit
+            for file_audit in previous.files
+            if file_audit.file_path not in changed
+        }
+
+        python_files = self._find_python_files(repo_path)
+        relative_paths = [str(py_file.relative_to(repo_path)) for py_file in python_files]
+        fresh = {
+            file_audit.file_path: file_audit
+            for file_audit in self._audit_files(
+                [
+                    py_file
+                    for py_file, relative_path in zip(python_files, relative_paths)
+                    if relative_path not in reuse
+                ],
+                repo_path,
+                executor,
             )
+        }
+        logger.debug(
+            f"Incremental audit {sha[:7]}: {len(changed)} changed paths, "
+            f"{len(fresh)} files analyzed"
+        )
+        # Oversized or unreadable files are absent from both maps and drop out
+        return [
+            reuse.get(relative_path) or fresh[relative_path]
+            for relative_path in relative_paths
+            if relative_path in reuse or relative_path in fresh
+        ]
+
+    def _audit_changed_files_via_api(
+        self, repo_identifier: str, sha: str, previous: CommitAudit
+    ) -> List[FileAudit]:
+        """Audit a commit through the tree/blob API, reusing unchanged blobs.
+
+        Args:
+            repo_identifier: Repository identifier (e.g., "owner/repo")
+            sha: Commit SHA
+            previous: Audit of the commit's parent
+
+        Returns:
+            List of FileAudit objects, in tree order
+        """
+        parent_blobs = {
+            entry.path: entry.sha
+            for entry in self.connector.list_tree(repo_identifier, previous.commit_sha)
+        }
+        # Keyed like the blob audit cache, so a parent audit is only
+        # reused where the child's tree has the identical blob
+        reuse = {
+            (parent_blobs[file_audit.file_path], file_audit.file_path): file_audit
+            for file_audit in previous.files
+            if file_audit.file_path in parent_blobs
+        }
+        file_audits = self._audit_files_via_api(repo_identifier, sha, reuse=reuse)
+        logger.debug(
+            f"Incremental audit {sha[:7]}: {len(file_audits)} files, "
+            f"{len(reuse)} parent file audits eligible for reuse"
+        )
+        return file_audits
+
+    def _process_pool(self, max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+        """Create a process pool for per-file analysis.
 
-            # Count issues by severity
-            critical_count = sum(
-                1 for issue in all_security_issues if issue["severity"] == "critical"
+        Workers are started on first use, with POOL_START_METHOD.
+
+        Args:
+            max_workers: Pool size (default: self.max_workers)
+
+        Returns:
+            ProcessPoolExecutor (caller shuts it down)
+        """
+        return ProcessPoolExecutor(
+            max_workers=max_workers or self.max_workers,
+            mp_context=multiprocessing.get_context(POOL_START_METHOD),
+        )
+
+    def _audit_files(
+        self,
+        python_files: List[Path],
+        repo_path: str,
+        executor: Optional[Executor] = None,
+    ) -> List[FileAudit]:
+        """Audit files, skipping unchanged content and parallelizing the rest.
+
+        Each file is hashed first; files whose (content digest, path) pair was
+        audited before reuse that result. Bandit and radon are CPU-bound and
+        hold the GIL, so the remaining files are spread over a process pool,
+        scheduled largest-first. Small batches stay in-process because pool
+        startup would cost more than it saves.
+
+        Args:
+            python_files: Files to audit
+            repo_path: Root of repository (for relative path calculation)
+            executor: Shared analysis pool (default: a pool per call, sized
+                to the files left to analyze)
+
+        Returns:
+            List of FileAudit objects, in input order
+        """
+        results: List[Optional[FileAudit]] = [None] * len(python_files)
+        pending: List[Tuple[int, Tuple[str, str], str]] = []
+        sources: List[str] = []
+        # Files come from walking repo_path, so a string slice usually
+        # replaces Path.relative_to (which compares part by part)
+        root_prefix = str(Path(repo_path)) + os.sep
+
+        for index, py_file in enumerate(python_files):
+            path_str = str(py_file)
+            if path_str.startswith(root_prefix):
+                relative_path = path_str[len(root_prefix):]
+            else:
+                relative_path = str(py_file.relative_to(repo_path))
+            try:
+                if self._is_oversized(relative_path, py_file.stat().st_size):
+                    continue
+                data = py_file.read_bytes()
+                code = data.decode("utf-8")
+            except (OSError, UnicodeDecodeError) as e:
+                results[index] = self._failed_file_audit(relative_path, e)
+                continue
+
+            cache_key = (hashlib.blake2b(data, digest_size=16).hexdigest(), relative_path)
+            cached = self._file_audit_cache.get(cache_key)
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append((index, cache_key, relative_path))
+                sources.append(code)
+
+        if len(pending) < len(python_files):
+            logger.debug(
+                f"File audit cache: {len(python_files) - len(pending)} hits, "
+                f"{len(pending)} misses"
             )
-            high_count = sum(
-                1 for issue in all_security_issues if issue["severity"] == "high"
-            ) + sum(1 for issue in all_complexity_issues if issue["severity"] == "high")
-            medium_count = sum(
-                1 for issue in all_security_issues if issue["severity"] == "medium"
-            ) + sum(1 for issue in all_complexity_issues if issue["severity"] == "medium")
-            low_count = sum(
-                1 for issue in all_security_issues if issue["severity"] == "low"
-            ) + sum(1 for issue in all_complexity_issues if issue["severity"] == "low")
-
-            return CommitAudit(
-                repository=repo_identifier,
-                commit_sha=commit.sha,
-                commit_message=commit.message,
-                author=commit.author,
-                author_email=commit.author_email,
-                date=commit.date,
-                files_changed=commit.files_changed,
-                files=file_audits,  # NEW: per-file audits
-                security_issues=all_security_issues,
-                security_score=security_score,
-                complexity_issues=all_complexity_issues,
-                avg_complexity=avg_complexity,
-                max_complexity=max_complexity,
-                total_issues=len(all_security_issues) + len(all_complexity_issues),
-                critical_issues=critical_count,
-                high_issues=high_count,
-                medium_issues=medium_count,
-                low_issues=low_count,
-                quality_score=quality_score,
+
+        relative_paths = [relative_path for _, _, relative_path in pending]
+        if self.max_workers <= 1 or len(pending) < PARALLEL_MIN_FILES:
+            analyzed = [
+                self._audit_code(code, relative_path)
+                for code, relative_path in zip(sources, relative_paths)
+            ]
+        else:
+            if executor is None:
+                pool = self._process_pool(min(self.max_workers, len(pending)))
+            else:
+                pool = nullcontext(executor)
+            # Largest files first, one task each: idle workers pull the next
+            # biggest file, so one huge file can't end up last in a chunk
+            largest_first = sorted(
+                range(len(sources)), key=lambda i: len(sources[i]), reverse=True
             )
+            with pool as pool_executor:
+                futures = {
+                    i: pool_executor.submit(
+                        _audit_code_worker, sources[i], relative_paths[i]
+                    )
+                    for i in largest_first
+                }
+                analyzed = [futures[i].result() for i in range(len(sources))]
+
+        for (index, cache_key, _), file_audit in zip(pending, analyzed):
+            if self.cache_file_audits:
+                self._file_audit_cache[cache_key] = file_audit
+            results[index] = file_audit
+
+        # Skip files that failed to analyze
+        return [file_audit for file_audit in results if file_audit]
+
+    def _audit_files_via_api(
+        self,
+        repo_identifier: str,
+        sha: str,
+        reuse: Optional[Mapping[Tuple[str, str], FileAudit]] = None,
+    ) -> List[FileAudit]:
+        """Audit every Python file at a commit by reading blobs through the API.
 
-    def _audit_single_file(self, file_path: Path, repo_root: str) -> Optional[FileAudit]:
-        """Audit a single file.
+        Only blobs not seen before are downloaded (concurrently); files whose
+        blob SHA is already cached cost no network and no analysis.
 
         Args:
-            file_path: Path to Python file
-            repo_root: Root of repository (for relative path calculation)
+            repo_identifier: Repository identifier (e.g., "owner/repo")
+            sha: Commit SHA
+            reuse: Known audits by (blob SHA, file path), used instead of
+                downloading and analyzing those files
 
         Returns:
-            FileAudit object or None if file couldn't be analyzed
+            List of FileAudit objects, in tree order
+        """
+        reuse = reuse or {}
+        entries = [
+            entry
+            for entry in self.connector.list_tree(repo_identifier, sha)
+            if entry.path.endswith(".py")
+            and not self._is_excluded_path(entry.path.split("/"))
+            and not self._is_oversized(entry.path, entry.size)
+        ]
+
+        missing = [
+            entry
+            for entry in entries
+            if (entry.sha, entry.path) not in reuse
+            and (entry.sha, entry.path) not in self._blob_audit_cache
+        ]
+        if missing:
+            with ThreadPoolExecutor(max_workers=BLOB_FETCH_WORKERS) as executor:
+                blobs = executor.map(
+                    lambda entry: self.connector.get_blob(repo_identifier, entry.sha),
+                    missing,
+                )
+                for entry, data in zip(missing, blobs):
+                    try:
+                        code = data.decode("utf-8")
+                    except UnicodeDecodeError as e:
+                        file_audit = self._failed_file_audit(entry.path, e)
+                    else:
+                        file_audit = self._audit_code(code, entry.path)
+                    self._blob_audit_cache[(entry.sha, entry.path)] = file_audit
+
+        return [
+            reuse.get((entry.sha, entry.path))
+            or self._blob_audit_cache[(entry.sha, entry.path)]
+            for entry in entries
+        ]
+
+    def _build_commit_audit(
+        self,
+        repo_identifier: str,
+        commit: CommitInfo,
+        file_audits: List[FileAudit],
+        started: Optional[float] = None,
+    ) -> CommitAudit:
+        """Aggregate per-file audits into a commit-level audit.
+
+        Args:
+            repo_identifier: Repository identifier (e.g., "owner/repo")
+            commit: Commit information
+            file_audits: Per-file audit results
+            started: time.perf_counter() value when the audit began, for
+                processing_time (default: not measured)
+
+        Returns:
+            CommitAudit with aggregated metrics
+        """
+        # Aggregate metrics from file audits in a single traversal. Per-file
+        # severity counts already cover both issue kinds; security severities
+        # are tallied separately because only they feed the security score.
+        all_security_issues = []
+        all_complexity_issues = []
+        security_counts: Counter = Counter()
+        total_complexity = 0.0
+        max_complexity = 0.0
+        total_function_count = 0
+        high_count = medium_count = low_count = 0
+
+        for file_audit in file_audits:
+            all_security_issues.extend(file_audit.security_issues)
+            all_complexity_issues.extend(file_audit.complexity_issues)
+            security_counts.update(issue["severity"] for issue in file_audit.security_issues)
+            total_complexity += file_audit.avg_complexity * file_audit.function_count
+            max_complexity = max(max_complexity, file_audit.max_complexity)
+            total_function_count += file_audit.function_count
+            high_count += file_audit.high_issues
+            medium_count += file_audit.medium_issues
+            low_count += file_audit.low_issues
+
+        # Calculate commit-level metrics
+        avg_complexity = (
+            total_complexity / total_function_count if total_function_count > 0 else 0.0
+        )
+        security_score = self._security_score_from_counts(security_counts)
+        quality_score = self._calculate_quality_score(
+            security_score, avg_complexity, len(all_complexity_issues)
+        )
+        critical_count = security_counts["critical"]
+
+        # Every field is computed here from already-validated FileAudits, so
+        # skip re-validation (it would deep-copy each issue dict again)
+        return CommitAudit.model_construct(
+            repository=repo_identifier,
+            commit_sha=commit.sha,
+            commit_message=commit.message,
+            author=commit.author,
+            author_email=commit.author_email,
+            date=commit.date,
+            files_changed=commit.files_changed,
+            files=file_audits,  # NEW: per-file audits
+            security_issues=all_security_issues,
+            security_score=security_score,
+            complexity_issues=all_complexity_issues,
+            avg_complexity=avg_complexity,
+            max_complexity=float(max_complexity),
+            total_issues=len(all_security_issues) + len(all_complexity_issues),
+            critical_issues=critical_count,
+            high_issues=high_count,
+            medium_issues=medium_count,
+            low_issues=low_count,
+            quality_score=quality_score,
+            processing_time=time.perf_counter() - started if started is not None else 0.0,
+        )
+
+    def _audit_code(self, code: str, relative_path: str) -> FileAudit:
+        """Analyze source code of a single file.
+
+        Args:
+            code: Python source code
+            relative_path: File path relative to repo root
+
+        Returns:
+            FileAudit object (quality_score=0 if analysis failed)
         """
         try:
-            code = file_path.read_text()
-            
-            # Get relative path from repo root
-            relative_path = str(file_path.relative_to(repo_root))
-            
             # Analyze security
             security_result = detect_security_issues(code)
             security_issues = []
             for issue in security_result.issues:
                 security_issues.append({
                     "type": "security",
-                    "severity": issue.issue_severity.lower(),
+                    "severity": _BANDIT_SEVERITY.get(issue.issue_severity)
+                    or issue.issue_severity.lower(),
                     "message": issue.issue_text,
                     "line": issue.line_number,
                     "file": relative_path,
@@ -167,10 +658,9 @@ class AuditEngine:
                 
                 # Flag high complexity
                 if complexity > 10:
-                    severity = self._get_complexity_severity(complexity)
                     complexity_issues.append({
                         "type": "complexity",
-                        "severity": severity,
+                        "severity": _complexity_severity(complexity),
                         "message": f"High complexity function '{func.name}' (complexity: {complexity})",
                         "line": func.lineno,
                         "file": relative_path,
@@ -180,115 +670,123 @@ class AuditEngine:
             avg_complexity_val = total_complexity / function_count if function_count > 0 else 0.0
             lines_of_code = len(code.splitlines())
             
-            # Count issues by severity
-            critical_count = sum(1 for i in security_issues if i["severity"] == "critical")
-            high_count = sum(1 for i in security_issues if i["severity"] == "high") + \
-                        sum(1 for i in complexity_issues if i["severity"] == "high")
-            medium_count = sum(1 for i in security_issues if i["severity"] == "medium") + \
-                          sum(1 for i in complexity_issues if i["severity"] == "medium")
-            low_count = sum(1 for i in security_issues if i["severity"] == "low") + \
-                       sum(1 for i in complexity_issues if i["severity"] == "low")
+            # Count issues by severity (one Counter pass per issue list)
+            security_counts = Counter(issue["severity"] for issue in security_issues)
+            severity_counts = security_counts + Counter(
+                issue["severity"] for issue in complexity_issues
+            )
             
             # Calculate scores
-            security_score = self._calculate_security_score(security_issues)
+            security_score = self._security_score_from_counts(security_counts)
             quality_score = self._calculate_quality_score(
                 security_score, avg_complexity_val, len(complexity_issues)
             )
             
-            return FileAudit(
+            # Trusted, freshly computed values: construct without validation
+            return FileAudit.model_construct(
                 file_path=relative_path,
                 security_issues=security_issues,
                 security_score=security_score,
                 complexity_issues=complexity_issues,
                 avg_complexity=avg_complexity_val,
-                max_complexity=max_complexity_val,
+                max_complexity=float(max_complexity_val),
                 function_count=function_count,
                 lines_of_code=lines_of_code,
                 total_issues=len(security_issues) + len(complexity_issues),
-                critical_issues=critical_count,
-                high_issues=high_count,
-                medium_issues=medium_count,
-                low_issues=low_count,
+                critical_issues=security_counts["critical"],
+                high_issues=severity_counts["high"],
+                medium_issues=severity_counts["medium"],
+                low_issues=severity_counts["low"],
                 quality_score=quality_score,
             )
         except Exception as e:
-            # File has critical issues (syntax error, encoding error, etc.)
-            # Return FileAudit with quality_score=0 instead of skipping
-            relative_path = str(file_path.relative_to(repo_root))
-            error_msg = str(e)
-            
-            return FileAudit(
-                file_path=relative_path,
-                security_issues=[],
-                security_score=0.0,
-                complexity_issues=[{
-                    "type": "syntax",
-                    "severity": "critical",
-                    "message": f"Failed to analyze file: {error_msg}",
-                    "line": 0,
-                    "file": relative_path,
-                }],
-                avg_complexity=0.0,
-                max_complexity=0.0,
-                function_count=0,
-                lines_of_code=0,
-                total_issues=1,
-                critical_issues=1,
-                high_issues=0,
-                medium_issues=0,
-                low_issues=0,
-                quality_score=0.0,  # Critical: file is broken
-            )
+            return self._failed_file_audit(relative_path, e)
 
-    def _get_complexity_severity(self, complexity: float) -> str:
-        """Determine severity based on complexity value.
+    def _failed_file_audit(self, relative_path: str, error: Exception) -> FileAudit:
+        """Build FileAudit for a file that could not be analyzed.
+
+        File has critical issues (syntax error, encoding error, etc.), so it
+        gets quality_score=0 instead of being skipped.
 
         Args:
-            complexity: Cyclomatic complexity value
+            relative_path: File path relative to repo root
+            error: Exception raised while reading or analyzing the file
 
         Returns:
-            Severity string
+            FileAudit with a single critical syntax issue
         """
-        if complexity > 20:
-            return "critical"
-        elif complexity > 15:
-            return "high"
-        elif complexity > 10:
-            return "medium"
-        else:
-            return "low"
+        error_msg = str(error)
+
+        return FileAudit(
+            file_path=relative_path,
+            security_issues=[],
+            security_score=0.0,
+            complexity_issues=[{
+                "type": "syntax",
+                "severity": "critical",
+                "message": f"Failed to analyze file: {error_msg}",
+                "line": 0,
+                "file": relative_path,
+            }],
+            avg_complexity=0.0,
+            max_complexity=0.0,
+            function_count=0,
+            lines_of_code=0,
+            total_issues=1,
+            critical_issues=1,
+            high_issues=0,
+            medium_issues=0,
+            low_issues=0,
+            quality_score=0.0,  # Critical: file is broken
+        )
+
+    def _is_excluded_path(self, parts: Sequence[str]) -> bool:
+        """Check whether any path component is an excluded directory.
+
+        Args:
+            parts: Path components (e.g. Path.parts or "a/b/c.py".split("/"))
+
+        Returns:
+            True if the path lies inside an excluded directory
+        """
+        return not self.EXCLUDE_DIRS.isdisjoint(parts)
+
+    def _is_oversized(self, relative_path: str, size: Optional[int]) -> bool:
+        """Check whether a file exceeds max_file_bytes (and log the skip).
+
+        Args:
+            relative_path: File path relative to repo root
+            size: File size in bytes, if known
+
+        Returns:
+            True if the file should be left out of the audit
+        """
+        if self.max_file_bytes is None or size is None or size <= self.max_file_bytes:
+            return False
+        logger.info(f"Skipping {relative_path}: {size} bytes exceeds {self.max_file_bytes}")
+        return True
 
     def _find_python_files(self, repo_path: str) -> List[Path]:
         """Find all Python files in repository.
 
+        Excluded directories are pruned before descending, so large trees
+        such as .git or node_modules are never listed.
+
         Args:
             repo_path: Path to cloned repository
 
         Returns:
-            List of Python file paths
+            List of Python file paths, in deterministic (sorted walk) order
         """
-        repo = Path(repo_path)
         python_files = []
 
-        # Exclude common non-source directories
-        exclude_dirs = {
-            ".git",
-            "__pycache__",
-            "venv",
-            ".venv",
-            "env",
-            "node_modules",
-            ".tox",
-            "build",
-            "dist",
-            ".eggs",
-        }
-
-        for py_file in repo.rglob("*.py"):
-            # Skip excluded directories
-            if any(excluded in py_file.parts for excluded in exclude_dirs):
-                continue
-            python_files.append(py_file)
+        for root, dirs, files in os.walk(repo_path):
+            # In-place update tells os.walk not to recurse into excluded dirs
+            dirs[:] = sorted(d for d in dirs if d not in self.EXCLUDE_DIRS)
+            root_path = Path(root)
+            python_files.extend(
+                root_path / name for name in sorted(files) if name.endswith(".py")
+            )
 
         return python_files
 
@@ -304,19 +802,9 @@ class AuditEngine:
         """
         complexity = func_data.cyclomatic_complexity
 
-        # Determine severity based on complexity
-        if complexity > 20:
-            severity = "critical"
-        elif complexity > 15:
-            severity = "high"
-        elif complexity > 10:
-            severity = "medium"
-        else:
-            severity = "low"
-
         return {
             "type": "complexity",
-            "severity": severity,
+            "severity": _complexity_severity(complexity),
             "message": f"High complexity function '{func_data.name}' (complexity: {complexity})",
             "line": func_data.lineno,
             "file": str(file_path),
@@ -334,19 +822,26 @@ class AuditEngine:
         if not issues:
             return 100.0
 
-        # Weight issues by severity
-        penalty = 0.0
-        for issue in issues:
-            severity = issue["severity"]
-            if severity == "critical":
-                penalty += 20.0
-            elif severity == "high":
-                penalty += 10.0
-            elif severity == "medium":
-                penalty += 5.0
-            elif severity == "low":
-                penalty += 1.0
+        return self._security_score_from_counts(
+            Counter(issue["severity"] for issue in issues)
+        )
+
+    def _security_score_from_counts(self, severity_counts: Mapping[str, int]) -> float:
+        """Calculate security score from per-severity issue counts.
+
+        Scoring is a weighted sum over four counts instead of a branch per
+        issue, so callers that already counted severities pay O(1) here.
+
+        Args:
+            severity_counts: Mapping of severity -> number of issues
 
+        Returns:
+            Security score between 0 and 100
+        """
+        penalty = sum(
+            weight * severity_counts.get(severity, 0)
+            for severity, weight in SEVERITY_PENALTY.items()
+        )
         return max(0.0, 100.0 - penalty)
 
     def _calculate_quality_score(
@@ -375,3 +870,19 @@ class AuditEngine:
         score += complexity_score * 0.4
 
         return round(score, 2)
+
+
+# Per-process engine used by _audit_code_worker (analysis needs no connector)
+_worker_engine: Optional[AuditEngine] = None
+
+
+def _audit_code_worker(code: str, relative_path: str) -> FileAudit:
+    """Process-pool entry point: analyze one file's source.
+
+    Module-level so it pickles by reference; takes plain strings so the
+    engine (and its API connector) never crosses the process boundary.
+    """
+    global _worker_engine
+    if _worker_engine is None:
+        _worker_engine = AuditEngine(connector=None, max_workers=1)
+    return _worker_engine._audit_code(code, relative_path)
@@ -3,11 +3,17 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class FileAudit(BaseModel):
-    """Audit result for a single file within a commit."""
+    """Audit result for a single file within a commit.
+
+    Immutable: the audit engine only ever constructs new instances, so
+    freezing keeps file audits safe to share across aggregations.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     file_path: str = Field(description="File path relative to repo root")
 
@@ -49,7 +55,9 @@ class FileAudit(BaseModel):
 
 
 class CommitAudit(BaseModel):
-    """Audit result for a single commit."""
+    """Audit result for a single commit (immutable once built)."""
+
+    model_config = ConfigDict(frozen=True)
 
     repository: str = Field(description="Repository identifier (owner/repo)")
     commit_sha: str = Field(description="Commit SHA")
@@ -1,99 +1,102 @@
 """Configuration management for the code review system."""
 
 import os
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional
-from pydantic import BaseModel, Field
-from dotenv import load_dotenv
 
 
-class ModelConfig(BaseModel):
+# Config is built once from trusted environment variables, so plain frozen
+# dataclasses replace pydantic models (no schema build or validation pass).
+@dataclass(slots=True, frozen=True)
+class ModelConfig:
     """Configuration for Gemini models."""
     
-    analyzer_model: str = Field(default="gemini-2.5-flash")
-    temperature: float = Field(default=0.7)
-    max_tokens: int = Field(default=8192)
+    analyzer_model: str = "gemini-2.5-flash"
+    temperature: float = 0.7
+    max_tokens: int = 8192
 
 
-class GitHubConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class GitHubConfig:
     """Configuration for GitHub integration."""
     
-    token: str = Field(description="GitHub personal access token")
-    test_repo: Optional[str] = Field(default=None)
+    token: str  # GitHub personal access token
+    test_repo: Optional[str] = None
 
 
-class MemoryConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class MemoryConfig:
     """Configuration for memory and session management."""
     
-    enabled: bool = Field(default=True)
-    session_timeout: int = Field(default=3600)
+    enabled: bool = True
+    session_timeout: int = 3600
 
 
-class DeploymentConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class DeploymentConfig:
     """Deployment configuration."""
-    project_id: str = Field(default_factory=lambda: os.getenv("GOOGLE_CLOUD_PROJECT", ""))
-    region: str = Field(default_factory=lambda: os.getenv("DEPLOYMENT_REGION", "us-central1"))
+    project_id: str = field(default_factory=lambda: os.getenv("GOOGLE_CLOUD_PROJECT", ""))
+    region: str = field(default_factory=lambda: os.getenv("DEPLOYMENT_REGION", "us-central1"))
 
 
-class FirestoreConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class FirestoreConfig:
     """Configuration for Firestore database."""
     
-    database: str = Field(
-        default_factory=lambda: os.getenv("FIRESTORE_DATABASE", "(default)"),
-        description="Firestore database ID. Use '(default)' for default database."
-    )
-    collection_prefix: str = Field(
-        default="quality-guardian",
-        description="Prefix for Firestore collections"
-    )
+    # Firestore database ID. Use '(default)' for default database.
+    database: str = field(default_factory=lambda: os.getenv("FIRESTORE_DATABASE", "(default)"))
+    # Prefix for Firestore collections
+    collection_prefix: str = "quality-guardian"
 
 
-class TestFixtureConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class TestFixtureConfig:
     """Test fixture repository configuration."""
-    remote_repo: str = Field(
+    # Remote GitHub repository for test fixture
+    remote_repo: str = field(
         default_factory=lambda: os.getenv("TEST_FIXTURE_REPO") or 
-            f"{os.getenv('TEST_REPO_OWNER', 'RostislavDublin')}/{os.getenv('TEST_REPO_NAME', 'quality-guardian-test-fixture')}",
-        description="Remote GitHub repository for test fixture"
+            f"{os.getenv('TEST_REPO_OWNER', 'RostislavDublin')}/{os.getenv('TEST_REPO_NAME', 'quality-guardian-test-fixture')}"
     )
-    local_path: str = Field(
-        default="./test-fixture",
-        description="Local path to fixture template"
-    )
-    auto_deploy: bool = Field(
-        default_factory=lambda: os.getenv("AUTO_DEPLOY_FIXTURE", "false").lower() == "true",
-        description="Auto-deploy fixture on startup"
+    # Local path to fixture template
+    local_path: str = "./test-fixture"
+    # Auto-deploy fixture on startup
+    auto_deploy: bool = field(
+        default_factory=lambda: os.getenv("AUTO_DEPLOY_FIXTURE", "false").lower() == "true"
     )
 
 
-class AppConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class AppConfig:
     """Main application configuration."""
     
-    models: ModelConfig = Field(default_factory=ModelConfig)
     github: GitHubConfig
-    memory: MemoryConfig = Field(default_factory=MemoryConfig)
+    models: ModelConfig = field(default_factory=ModelConfig)
+    memory: MemoryConfig = field(default_factory=MemoryConfig)
     deployment: Optional[DeploymentConfig] = None
-    firestore: FirestoreConfig = Field(default_factory=FirestoreConfig)
-    test_fixture: TestFixtureConfig = Field(default_factory=TestFixtureConfig)
-    log_level: str = Field(default="INFO")
-    enable_tracing: bool = Field(default=True)
+    firestore: FirestoreConfig = field(default_factory=FirestoreConfig)
+    test_fixture: TestFixtureConfig = field(default_factory=TestFixtureConfig)
+    log_level: str = "INFO"
+    enable_tracing: bool = True
 
 
+@lru_cache(maxsize=8)
 def load_config(env_file: Optional[str] = None) -> AppConfig:
     """Load configuration from environment variables.
     
+    The result is cached per env_file: the .env file is read and the
+    models are built once per process. Call clear_config_cache() after
+    changing the environment (e.g., in tests).
+    
     Args:
         env_file: Path to .env file. If None, uses .env from current directory.
         
     Returns:
         Loaded application configuration.
     """
-    if env_file is None:
-        # Auto-detect environment
-        if os.path.exists(".env"):
-            env_file = ".env"
-        else:
-            env_file = ".env"
-    
-    load_dotenv(env_file)
+    from dotenv import load_dotenv
+
+    load_dotenv(env_file or ".env")
     
     github_config = GitHubConfig(
         token=os.getenv("GITHUB_TOKEN", ""),
@@ -125,3 +128,8 @@ def load_config(env_file: Optional[str] = None) -> AppConfig:
         log_level=os.getenv("LOG_LEVEL", "INFO"),
         enable_tracing=os.getenv("ENABLE_TRACING", "true").lower() == "true",
     )
+
+
+def clear_config_cache() -> None:
+    """Forget cached configurations so the next load_config re-reads the environment."""
+    load_config.cache_clear()
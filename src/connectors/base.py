@@ -1,12 +1,14 @@
 """Abstract base class for repository connectors."""
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 
-@dataclass
+# Commits and tree entries are created per commit/file, so the record types
+# use __slots__ (smaller instances, no per-object __dict__).
+@dataclass(slots=True)
 class CommitInfo:
     """Information about a repository commit."""
 
@@ -18,9 +20,10 @@ class CommitInfo:
     files_changed: List[str]
     additions: int
     deletions: int
+    parents: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class TagInfo:
     """Information about a repository tag/release."""
 
@@ -30,7 +33,16 @@ class TagInfo:
     message: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
+class TreeEntry:
+    """A file (blob) in a repository tree at a specific commit."""
+
+    path: str
+    sha: str
+    size: int
+
+
+@dataclass(slots=True)
 class RepositoryInfo:
     """Basic repository metadata."""
 
@@ -81,6 +93,31 @@ class RepositoryConnector(ABC):
         """
         pass
 
+    def iter_commits(
+        self,
+        repo_identifier: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        branch: Optional[str] = None,
+        include_files: bool = True,
+    ) -> Iterator[CommitInfo]:
+        """Iterate commits newest first, so callers can stop early.
+
+        Connectors with paginated APIs should override this to fetch lazily;
+        the default materializes list_commits.
+
+        Args:
+            repo_identifier: Platform-specific repository identifier
+            since: Only commits after this date (inclusive)
+            until: Only commits before this date (inclusive)
+            branch: Branch name (defaults to repository's default branch)
+            include_files: Populate files_changed/additions/deletions
+
+        Yields:
+            CommitInfo objects, newest first
+        """
+        yield from self.list_commits(repo_identifier, since, until, branch)
+
     @abstractmethod
     def list_tags(self, repo_identifier: str) -> List[TagInfo]:
         """List all tags/releases in repository.
@@ -106,6 +143,32 @@ class RepositoryConnector(ABC):
         """
         pass
 
+    @abstractmethod
+    def list_tree(self, repo_identifier: str, sha: str) -> List[TreeEntry]:
+        """List all files in the repository tree at a commit.
+
+        Args:
+            repo_identifier: Platform-specific repository identifier
+            sha: Commit SHA
+
+        Returns:
+            List of TreeEntry objects (file blobs only, recursive; no symlinks)
+        """
+        pass
+
+    @abstractmethod
+    def get_blob(self, repo_identifier: str, blob_sha: str) -> bytes:
+        """Get raw content of a file blob.
+
+        Args:
+            repo_identifier: Platform-specific repository identifier
+            blob_sha: Blob SHA from list_tree
+
+        Returns:
+            Raw file bytes
+        """
+        pass
+
     @abstractmethod
     def clone_repository(
         self, repo_identifier: str, target_path: str, sha: Optional[str] = None
@@ -121,3 +184,28 @@ class RepositoryConnector(ABC):
             Absolute path to cloned repository
         """
         pass
+
+    @abstractmethod
+    def checkout_commit(self, repo_path: str, sha: str) -> None:
+        """Switch a clone made by clone_repository to another commit.
+
+        Args:
+            repo_path: Local path returned by clone_repository
+            sha: Commit SHA to check out
+        """
+        pass
+
+    @abstractmethod
+    def changed_files(self, repo_path: str, base_sha: str, sha: str) -> List[str]:
+        """List files that differ between two commits, using a local clone.
+
+        Args:
+            repo_path: Local path returned by clone_repository
+            base_sha: Commit to compare from
+            sha: Commit to compare to
+
+        Returns:
+            Changed paths relative to the repository root (renames list both
+            the old and the new path)
+        """
+        pass
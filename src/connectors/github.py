@@ -1,17 +1,67 @@
 """GitHub connector implementation using PyGithub."""
 
+import base64
+import os
+import shutil
 import subprocess
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional
-
-import requests
-from github import Auth, Github
-from github.Commit import Commit
-from github.Repository import Repository
-from github.Tag import Tag
-
-from .base import CommitInfo, RepositoryConnector, RepositoryInfo, TagInfo
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+
+# PyGithub/requests are imported when a connector is constructed, so
+# importing this module (e.g., for CommitInfo plumbing) stays cheap
+if TYPE_CHECKING:
+    from github.Commit import Commit
+    from github.Repository import Repository
+
+from .base import CommitInfo, RepositoryConnector, RepositoryInfo, TagInfo, TreeEntry
+
+# Repository metadata rarely changes; cache it briefly per connector
+REPO_INFO_TTL_SECONDS = 300
+REPO_INFO_CACHE_SIZE = 64
+
+# Concurrent per-commit detail requests (files/stats) in iter_commits;
+# PyGithub's default retry already backs off on secondary rate limits
+COMMIT_DETAIL_WORKERS = 8
+
+# Raw REST/GraphQL calls share one pooled session; GETs retry on transient errors
+HTTP_RETRY_TOTAL = 3
+HTTP_RETRY_BACKOFF = 0.5
+HTTP_RETRY_STATUSES = (502, 503, 504)
+
+# Tree entry mode of a symbolic link (its blob holds the target path)
+GIT_SYMLINK_MODE = "120000"
+
+# One page of tags with their commits, peeling annotated tags
+_TAGS_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    refs(refPrefix: "refs/tags/", first: 100, after: $cursor) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        target {
+          __typename
+          ...CommitFields
+          ... on Tag { target { ...CommitFields } }
+        }
+      }
+    }
+  }
+}
+
+fragment CommitFields on Commit { oid message author { date } }
+"""
+
+
+def _parse_github_datetime(value: str) -> datetime:
+    """Parse a GitHub ISO 8601 timestamp ("...Z") into an aware datetime."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
 
 
 class GitHubConnector(RepositoryConnector):
@@ -23,30 +73,93 @@ class GitHubConnector(RepositoryConnector):
         Args:
             token: GitHub personal access token or app token
         """
+        import requests
+        from github import Auth, Github
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
         auth = Auth.Token(token)
         self._client = Github(auth=auth)
-
-    def _get_repository(self, repo_identifier: str) -> Repository:
+        # Keep-alive session for calls PyGithub doesn't cover (diffs, GraphQL)
+        self._session = requests.Session()
+        self._session.headers["Authorization"] = f"token {token}"
+        retry = Retry(
+            total=HTTP_RETRY_TOTAL,
+            backoff_factor=HTTP_RETRY_BACKOFF,
+            status_forcelist=HTTP_RETRY_STATUSES,
+        )
+        self._session.mount("https://", HTTPAdapter(max_retries=retry))
+        # repo_identifier -> (fetched_at, info), least recently used first
+        self._repo_info_cache: OrderedDict[str, Tuple[float, RepositoryInfo]] = OrderedDict()
+        # repo_identifier -> PyGithub Repository, least recently used first
+        self._repo_cache: OrderedDict[str, "Repository"] = OrderedDict()
+        # Guards both caches: blob/commit-detail worker threads share the
+        # connector, and LRU bookkeeping is a read-modify-write. API calls
+        # happen outside the lock.
+        self._cache_lock = threading.Lock()
+
+    def _get_repository(self, repo_identifier: str) -> "Repository":
         """Get repository object by identifier.
 
+        The Repository object is cached (LRU, at most REPO_INFO_CACHE_SIZE),
+        so a workflow calling several connector methods on one repository
+        pays for a single GET /repos/:repo.
+
         Args:
             repo_identifier: Repository in format "owner/repo"
 
         Returns:
             PyGithub Repository object
         """
-        return self._client.get_repo(repo_identifier)
+        with self._cache_lock:
+            repo = self._repo_cache.get(repo_identifier)
+            if repo is not None:
+                self._repo_cache.move_to_end(repo_identifier)
+                return repo
+        return self._load_repository(repo_identifier)
+
+    def _load_repository(self, repo_identifier: str) -> "Repository":
+        """Fetch a repository from the API and (re)populate the cache."""
+        repo = self._client.get_repo(repo_identifier)
+        with self._cache_lock:
+            self._repo_cache[repo_identifier] = repo
+            self._repo_cache.move_to_end(repo_identifier)
+            if len(self._repo_cache) > REPO_INFO_CACHE_SIZE:
+                self._repo_cache.popitem(last=False)
+        return repo
 
     def get_repository_info(self, repo_identifier: str) -> RepositoryInfo:
         """Get basic repository metadata.
 
+        Results are cached for REPO_INFO_TTL_SECONDS (LRU, at most
+        REPO_INFO_CACHE_SIZE repositories), saving two API round-trips
+        per repeated lookup.
+
         Args:
             repo_identifier: Repository in format "owner/repo"
 
         Returns:
             RepositoryInfo with metadata
         """
-        repo = self._get_repository(repo_identifier)
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._repo_info_cache.get(repo_identifier)
+            if cached and now - cached[0] < REPO_INFO_TTL_SECONDS:
+                self._repo_info_cache.move_to_end(repo_identifier)
+                return cached[1]
+
+        info = self._fetch_repository_info(repo_identifier)
+        with self._cache_lock:
+            self._repo_info_cache[repo_identifier] = (now, info)
+            self._repo_info_cache.move_to_end(repo_identifier)
+            if len(self._repo_info_cache) > REPO_INFO_CACHE_SIZE:
+                self._repo_info_cache.popitem(last=False)
+        return info
+
+    def _fetch_repository_info(self, repo_identifier: str) -> RepositoryInfo:
+        """Fetch repository metadata from the API (uncached)."""
+        # Refresh the cached Repository too, so its metadata honors the TTL
+        repo = self._load_repository(repo_identifier)
         return RepositoryInfo(
             full_name=repo.full_name,
             owner=repo.owner.login,
@@ -76,6 +189,33 @@ class GitHubConnector(RepositoryConnector):
         Returns:
             List of CommitInfo objects, newest first
         """
+        return list(self.iter_commits(repo_identifier, since, until, branch))
+
+    def iter_commits(
+        self,
+        repo_identifier: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        branch: Optional[str] = None,
+        include_files: bool = True,
+    ) -> Iterator[CommitInfo]:
+        """Yield commits newest first, fetching pages only as consumed.
+
+        Files and stats are not part of GitHub's commit listing, so each
+        commit with include_files=True costs one extra request; callers that
+        stop early (e.g., at the last audited SHA) skip the rest.
+
+        Args:
+            repo_identifier: Repository in format "owner/repo"
+            since: Only commits after this date (inclusive)
+            until: Only commits before this date (inclusive)
+            branch: Branch name (defaults to default branch)
+            include_files: Fetch files_changed/additions/deletions (otherwise
+                left empty/zero)
+
+        Yields:
+            CommitInfo objects, newest first
+        """
         repo = self._get_repository(repo_identifier)
         sha = branch if branch else repo.default_branch
 
@@ -85,56 +225,121 @@ class GitHubConnector(RepositoryConnector):
             kwargs["since"] = since
         if until is not None:
             kwargs["until"] = until
-        commits = repo.get_commits(**kwargs)
 
-        result = []
-        for commit in commits:
+        listing = iter(repo.get_commits(**kwargs))
+        if not include_files:
+            for commit in listing:
+                yield self._to_commit_info(commit, include_files=False)
+            return
+
+        # Files/stats cost one request per commit; overlap them a window at a
+        # time so early-stopping callers over-fetch at most one window
+        with ThreadPoolExecutor(max_workers=COMMIT_DETAIL_WORKERS) as executor:
+            while True:
+                window = list(islice(listing, COMMIT_DETAIL_WORKERS))
+                if not window:
+                    return
+                yield from executor.map(self._to_commit_info, window)
+
+    @staticmethod
+    def _to_commit_info(commit: "Commit", include_files: bool = True) -> CommitInfo:
+        """Convert a PyGithub commit from a listing into CommitInfo.
+
+        Args:
+            commit: PyGithub Commit (listing payload)
+            include_files: Fetch files/stats (one extra API request)
+
+        Returns:
+            CommitInfo object
+        """
+        files_changed: List[str] = []
+        additions = deletions = 0
+        if include_files:
             # Get file changes from commit details
             files = commit.files if commit.files else []
-            result.append(
-                CommitInfo(
-                    sha=commit.sha,
-                    message=commit.commit.message,
-                    author=commit.commit.author.name,
-                    author_email=commit.commit.author.email,
-                    date=commit.commit.author.date,
-                    files_changed=[f.filename for f in files],
-                    additions=commit.stats.additions,
-                    deletions=commit.stats.deletions,
-                )
-            )
-
-        return result
+            files_changed = [f.filename for f in files]
+            additions = commit.stats.additions
+            deletions = commit.stats.deletions
+        return CommitInfo(
+            sha=commit.sha,
+            message=commit.commit.message,
+            author=commit.commit.author.name,
+            author_email=commit.commit.author.email,
+            date=commit.commit.author.date,
+            files_changed=files_changed,
+            additions=additions,
+            deletions=deletions,
+            parents=[parent.sha for parent in commit.parents],
+        )
 
     def list_tags(self, repo_identifier: str) -> List[TagInfo]:
         """List all tags/releases in repository.
 
+        Tag names, commit SHAs, dates and messages come from one GraphQL
+        query per 100 tags; the REST tag listing carries no commit date and
+        would need one extra request per tag.
+
         Args:
             repo_identifier: Repository in format "owner/repo"
 
         Returns:
             List of TagInfo objects, newest first
         """
-        repo = self._get_repository(repo_identifier)
-        tags = repo.get_tags()
-
+        owner, name = repo_identifier.split("/", 1)
         result = []
-        for tag in tags:
-            # Get commit date from tag's commit
-            commit = repo.get_commit(tag.commit.sha)
-            result.append(
-                TagInfo(
-                    name=tag.name,
-                    sha=tag.commit.sha,
-                    date=commit.commit.author.date,
-                    message=commit.commit.message,
-                )
+        cursor = None
+
+        while True:
+            data = self._graphql(
+                _TAGS_QUERY, {"owner": owner, "name": name, "cursor": cursor}
             )
+            refs = data["repository"]["refs"]
+            for node in refs["nodes"]:
+                target = node["target"]
+                # Annotated tags point at a Tag object; peel it to the commit
+                if target.get("__typename") == "Tag":
+                    target = target.get("target") or {}
+                if "oid" not in target:
+                    continue
+                result.append(
+                    TagInfo(
+                        name=node["name"],
+                        sha=target["oid"],
+                        date=_parse_github_datetime(target["author"]["date"]),
+                        message=target["message"],
+                    )
+                )
+            if not refs["pageInfo"]["hasNextPage"]:
+                break
+            cursor = refs["pageInfo"]["endCursor"]
 
         # Sort by date descending (newest first)
         result.sort(key=lambda t: t.date, reverse=True)
         return result
 
+    def _graphql(self, query: str, variables: dict) -> dict:
+        """Run a GitHub GraphQL query.
+
+        Args:
+            query: GraphQL query document
+            variables: Query variables
+
+        Returns:
+            The response's "data" object
+
+        Raises:
+            RuntimeError: If GitHub reports GraphQL errors
+        """
+        response = self._session.post(
+            "https://api.github.com/graphql",
+            json={"query": query, "variables": variables},
+        )
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get("errors"):
+            raise RuntimeError(f"GitHub GraphQL error: {payload['errors']}")
+        return payload["data"]
+
     def get_commit_diff(self, repo_identifier: str, sha: str) -> str:
         """Get unified diff for a specific commit.
 
@@ -146,16 +351,54 @@ class GitHubConnector(RepositoryConnector):
             Unified diff string
         """
         # PyGithub doesn't expose commit diff directly, use raw API
-        response = requests.get(
+        response = self._session.get(
             f"https://api.github.com/repos/{repo_identifier}/commits/{sha}",
-            headers={
-                "Accept": "application/vnd.github.v3.diff",
-                "Authorization": f"token {self._client._Github__requester.auth.token}",
-            },
+            headers={"Accept": "application/vnd.github.v3.diff"},
         )
         response.raise_for_status()
         return response.text
 
+    def list_tree(self, repo_identifier: str, sha: str) -> List[TreeEntry]:
+        """List all files in the repository tree at a commit.
+
+        Args:
+            repo_identifier: Repository in format "owner/repo"
+            sha: Commit SHA
+
+        Returns:
+            List of TreeEntry objects (file blobs only, recursive; symlinks
+            are skipped since their blob is the link target path)
+
+        Raises:
+            RuntimeError: If GitHub truncated the tree (very large repository)
+        """
+        repo = self._get_repository(repo_identifier)
+        tree = repo.get_git_tree(sha, recursive=True)
+        if tree.truncated:
+            raise RuntimeError(f"Tree for {repo_identifier}@{sha[:7]} is truncated")
+
+        return [
+            TreeEntry(path=element.path, sha=element.sha, size=element.size or 0)
+            for element in tree.tree
+            if element.type == "blob" and element.mode != GIT_SYMLINK_MODE
+        ]
+
+    def get_blob(self, repo_identifier: str, blob_sha: str) -> bytes:
+        """Get raw content of a file blob.
+
+        Args:
+            repo_identifier: Repository in format "owner/repo"
+            blob_sha: Blob SHA from list_tree
+
+        Returns:
+            Raw file bytes
+        """
+        repo = self._get_repository(repo_identifier)
+        blob = repo.get_git_blob(blob_sha)
+        if blob.encoding == "base64":
+            return base64.b64decode(blob.content)
+        return blob.content.encode("utf-8")
+
     def clone_repository(
         self, repo_identifier: str, target_path: str, sha: Optional[str] = None
     ) -> str:
@@ -176,22 +419,97 @@ class GitHubConnector(RepositoryConnector):
         target = Path(target_path)
         target.mkdir(parents=True, exist_ok=True)
 
-        # Clone repository
-        subprocess.run(
-            ["git", "clone", clone_url, str(target)],
+        if not sha:
+            # Only the tip is audited, so history is not needed
+            self._run_git(
+                ["clone", "--depth", "1", "--no-tags", "--single-branch", clone_url, str(target)]
+            )
+            return str(target.absolute())
+
+        # Fetch just the requested commit (no history, no other refs)
+        self._run_git(["init", "--quiet", str(target)])
+        self._run_git(["remote", "add", "origin", clone_url], cwd=target)
+        try:
+            self._run_git(["fetch", "--depth", "1", "--no-tags", "origin", sha], cwd=target)
+        except subprocess.CalledProcessError:
+            # Servers may refuse fetching by SHA; fall back to a blobless clone
+            # (full history, but only the checked-out commit's blobs download)
+            shutil.rmtree(target / ".git", ignore_errors=True)
+            self._run_git(
+                ["clone", "--filter=blob:none", "--no-checkout", clone_url, str(target)]
+            )
+            self._run_git(["checkout", "--quiet", sha], cwd=target)
+        else:
+            self._run_git(["checkout", "--quiet", "--detach", "FETCH_HEAD"], cwd=target)
+
+        return str(target.absolute())
+
+    def checkout_commit(self, repo_path: str, sha: str) -> None:
+        """Switch an existing clone to another commit.
+
+        Commits missing from a shallow clone are fetched (depth 1) first.
+
+        Args:
+            repo_path: Path returned by clone_repository
+            sha: Commit SHA to check out
+        """
+        target = Path(repo_path)
+        try:
+            self._run_git(["checkout", "--quiet", "--detach", sha], cwd=target)
+        except subprocess.CalledProcessError:
+            self._run_git(["fetch", "--depth", "1", "--no-tags", "origin", sha], cwd=target)
+            self._run_git(["checkout", "--quiet", "--detach", "FETCH_HEAD"], cwd=target)
+
+    def changed_files(self, repo_path: str, base_sha: str, sha: str) -> List[str]:
+        """List files that differ between two commits, using a local clone.
+
+        Either commit missing from a shallow clone is fetched (depth 1)
+        first; only the two trees are compared, so no history is needed.
+
+        Args:
+            repo_path: Path returned by clone_repository
+            base_sha: Commit to compare from
+            sha: Commit to compare to
+
+        Returns:
+            Changed paths, relative to the repository root; a rename lists
+            both the old and the new path
+        """
+        target = Path(repo_path)
+        for commit_sha in (base_sha, sha):
+            try:
+                self._run_git(["cat-file", "-e", f"{commit_sha}^{{commit}}"], cwd=target)
+            except subprocess.CalledProcessError:
+                self._run_git(
+                    ["fetch", "--depth", "1", "--no-tags", "origin", commit_sha], cwd=target
+                )
+
+        result = self._run_git(
+            ["diff", "--name-only", "--no-renames", "-z", base_sha, sha], cwd=target
+        )
+        return [path for path in result.stdout.split("\0") if path]
+
+    @staticmethod
+    def _run_git(
+        args: List[str], cwd: Optional[Path] = None
+    ) -> subprocess.CompletedProcess:
+        """Run a git command, raising CalledProcessError on failure.
+
+        Credential prompts are disabled so a private or missing repository
+        fails immediately instead of hanging on stdin.
+
+        Args:
+            args: Arguments after "git"
+            cwd: Working directory (default: current directory)
+
+        Returns:
+            Completed process, with stdout captured as text
+        """
+        return subprocess.run(
+            ["git", *args],
+            cwd=str(cwd) if cwd is not None else None,
             check=True,
             capture_output=True,
             text=True,
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
         )
-
-        # Checkout specific SHA if provided
-        if sha:
-            subprocess.run(
-                ["git", "checkout", sha],
-                cwd=str(target),
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-
-        return str(target.absolute())
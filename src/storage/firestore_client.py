@@ -1,8 +1,12 @@
 """Firestore client for audit data storage and retrieval."""
 
 import logging
+import threading
+from collections import Counter
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Set, Tuple
+from google.api_core.exceptions import Conflict
 from google.cloud import firestore
 from google.cloud.firestore_v1.base_query import FieldFilter
 
@@ -10,6 +14,18 @@ from audit_models import CommitAudit
 
 logger = logging.getLogger(__name__)
 
+# BulkWriter retry budget per operation (the library default)
+BULK_WRITE_MAX_ATTEMPTS = 15
+
+# gRPC status code for create() on an existing document
+GRPC_ALREADY_EXISTS = 6
+
+
+# Commit documents keep queryable scalars as fields; these nested lists are
+# stored only inside the JSON body (exempt the body field from indexing)
+_BODY_FIELD = "body"
+_BODY_ONLY_FIELDS = frozenset({"files", "security_issues", "complexity_issues"})
+
 
 class FirestoreAuditDB:
     """Firestore database client for storing and querying commit audits.
@@ -43,6 +59,8 @@ class FirestoreAuditDB:
         self.client = firestore.Client(project=project_id, database=database)
         self.collection_prefix = collection_prefix
         self.repositories_collection = f"{collection_prefix}-repositories"
+        # Repository documents known to exist (skips the first_analyzed check)
+        self._known_repo_ids: Set[str] = set()
         logger.info(
             f"Initialized Firestore client: project={project_id or 'default'}, "
             f"database={database}, collection={self.repositories_collection}"
@@ -59,50 +77,166 @@ class FirestoreAuditDB:
         """
         return repository.replace("/", "_")
     
+    @staticmethod
+    def _repo_exists(repo_ref) -> bool:
+        """Check a repository document exists without reading its fields."""
+        return repo_ref.get(field_paths=[]).exists
+    
+    @staticmethod
+    def _commit_document(audit: CommitAudit) -> Dict[str, Any]:
+        """Serialize an audit for storage.
+        
+        Commit-level scalars and files_changed are stored as regular fields
+        so Firestore filters/ordering and the client-side filters keep
+        working. The full audit (nested per-file and issue lists, which
+        dominate encoding cost) rides in one "body" bytes field produced by
+        pydantic-core's JSON serializer, skipping the client's per-value
+        protobuf encoding; defaults are omitted there and restored on read.
+        The body field needs a single-field index exemption, since queries
+        never touch it (see query_by_repository for the command).
+        
+        Args:
+            audit: CommitAudit object to serialize
+            
+        Returns:
+            Document data (Firestore handles datetime objects natively)
+        """
+        data = audit.model_dump(exclude=_BODY_ONLY_FIELDS)
+        data[_BODY_FIELD] = audit.model_dump_json(exclude_defaults=True).encode()
+        return data
+    
+    @staticmethod
+    def _audit_from_document(data: Dict[str, Any]) -> CommitAudit:
+        """Rebuild a CommitAudit from a stored document.
+        
+        Args:
+            data: Document data from Firestore
+            
+        Returns:
+            CommitAudit object (documents written before the JSON body
+            was introduced are validated field by field)
+        """
+        body = data.get(_BODY_FIELD)
+        if body is not None:
+            return CommitAudit.model_validate_json(body)
+        return CommitAudit.model_validate(data)
+    
     def store_commit_audit(self, audit: CommitAudit) -> None:
         """Store commit audit data in Firestore.
         
         Creates/updates repository document and adds commit to subcollection.
+        The commit and repository writes go out in one batch. The commit is
+        written with create(), so a new commit needs no read; a re-audited
+        commit fails that precondition and is overwritten without bumping
+        total_commits. The repository document is read at most once per
+        process to decide whether to set first_analyzed.
         
         Args:
             audit: CommitAudit object to store
         """
         repo_id = self._get_repo_id(audit.repository)
         repo_ref = self.client.collection(self.repositories_collection).document(repo_id)
-        
-        # Check if commit already exists
         commit_ref = repo_ref.collection("commits").document(audit.commit_sha)
-        commit_exists = commit_ref.get().exists
-        
-        # Get or create repository document
-        repo_doc = repo_ref.get()
         now = firestore.SERVER_TIMESTAMP
         
-        if not repo_doc.exists:
-            # Create new repository document
-            repo_ref.set({
-                "name": audit.repository,
-                "total_commits": 1,
-                "first_analyzed": now,
-                "last_analyzed": now,
-            })
-            logger.info(f"Created repository document: {audit.repository}")
-        else:
-            # Update existing repository document
-            # Only increment total_commits if this is a NEW commit
-            update_data = {"last_analyzed": now}
-            if not commit_exists:
-                update_data["total_commits"] = firestore.Increment(1)
-            repo_ref.update(update_data)
-        
-        # Store commit in subcollection (overwrites if exists)
-        commit_data = audit.model_dump()
-        
-        # Firestore handles datetime objects natively, no conversion needed
-        commit_ref.set(commit_data)
-        action = "Updated" if commit_exists else "Stored"
+        repo_data = {"name": audit.repository, "last_analyzed": now}
+        if repo_id not in self._known_repo_ids and not self._repo_exists(repo_ref):
+            repo_data["first_analyzed"] = now
+            logger.info(f"Creating repository document: {audit.repository}")
+        
+        commit_data = self._commit_document(audit)
+        
+        batch = self.client.batch()
+        batch.create(commit_ref, commit_data)
+        # Only count NEW commits; Increment initializes a missing field
+        batch.set(repo_ref, {**repo_data, "total_commits": firestore.Increment(1)}, merge=True)
+        try:
+            batch.commit()
+            action = "Stored"
+        except Conflict:
+            # Commit already stored: overwrite it, keep total_commits
+            batch = self.client.batch()
+            batch.set(commit_ref, commit_data)
+            batch.set(repo_ref, repo_data, merge=True)
+            batch.commit()
+            action = "Updated"
+        
+        self._known_repo_ids.add(repo_id)
         logger.info(f"{action} commit audit: {audit.repository}@{audit.commit_sha[:7]}")
     
+    def store_commit_audits(self, audits: Iterable[CommitAudit]) -> int:
+        """Store many commit audits using a Firestore BulkWriter.
+        
+        For backfills: writes are batched and sent concurrently instead of
+        one round-trip per commit. Each repository document is updated once,
+        with total_commits incremented by the number of newly created commits.
+        Commits that already exist are overwritten without being counted.
+        
+        Args:
+            audits: CommitAudit objects to store
+            
+        Returns:
+            Number of newly stored commits
+        """
+        names: Dict[str, str] = {}
+        created: Counter = Counter()
+        existing: List[Any] = []
+        lock = threading.Lock()
+        
+        def on_result(reference, result, writer) -> None:
+            with lock:
+                created[reference.parent.parent.id] += 1
+        
+        def on_error(failure, writer) -> bool:
+            if failure.code == GRPC_ALREADY_EXISTS:
+                with lock:
+                    existing.append(failure.operation)
+                return False
+            return failure.attempts < BULK_WRITE_MAX_ATTEMPTS
+        
+        writer = self.client.bulk_writer()
+        writer.on_write_result(on_result)
+        writer.on_write_error(on_error)
+        
+        for audit in audits:
+            repo_id = self._get_repo_id(audit.repository)
+            names[repo_id] = audit.repository
+            commit_ref = (
+                self.client.collection(self.repositories_collection)
+                .document(repo_id)
+                .collection("commits")
+                .document(audit.commit_sha)
+            )
+            writer.create(commit_ref, self._commit_document(audit))
+        writer.flush()
+        # Creates are done; later writes must not be counted as new commits
+        writer.on_write_result(None)
+        
+        # Re-audited commits: overwrite, but don't count them again
+        for operation in existing:
+            writer.set(operation.reference, operation.document_data)
+        
+        now = firestore.SERVER_TIMESTAMP
+        for repo_id, repository in names.items():
+            repo_ref = self.client.collection(self.repositories_collection).document(repo_id)
+            repo_data = {
+                "name": repository,
+                "last_analyzed": now,
+                "total_commits": firestore.Increment(created[repo_id]),
+            }
+            if repo_id not in self._known_repo_ids and not self._repo_exists(repo_ref):
+                repo_data["first_analyzed"] = now
+            writer.set(repo_ref, repo_data, merge=True)
+            self._known_repo_ids.add(repo_id)
+        writer.close()
+        
+        total = sum(created.values())
+        logger.info(
+            f"Bulk stored {total} new and {len(existing)} updated commit audits "
+            f"across {len(names)} repositories"
+        )
+        return total
+    
     def get_repositories(self) -> List[str]:
         """Get list of all analyzed repositories.
         
@@ -110,7 +244,8 @@ class FirestoreAuditDB:
             List of repository names in format "owner/repo"
         """
         repos_ref = self.client.collection(self.repositories_collection)
-        docs = repos_ref.stream()
+        # Project to the one field we read instead of whole documents
+        docs = repos_ref.select(["name"]).stream()
         
         repositories = []
         for doc in docs:
@@ -126,30 +261,86 @@ class FirestoreAuditDB:
         repository: str,
         limit: Optional[int] = None,
         order_by: str = "date",
-        descending: bool = True
+        descending: bool = True,
+        filters: Optional[List[Tuple[str, str, Any]]] = None
     ) -> List[CommitAudit]:
         """Query commit audits for a specific repository.
         
+        Filters run server-side, so only matching documents are transferred
+        and the limit applies to matches. Filtering on a field other than
+        order_by needs a composite index on the commits collection group,
+        e.g. for author + date:
+        
+            gcloud firestore indexes composite create \\
+                --collection-group=commits \\
+                --field-config=field-path=author,order=ascending \\
+                --field-config=field-path=date,order=descending
+        
+        The "body" bytes field (see _commit_document) is never filtered or
+        ordered on, so it is exempted from Firestore's automatic single-field
+        indexes to save index writes and storage:
+        
+            gcloud firestore indexes fields update body \\
+                --collection-group=commits --disable-indexes
+        
         Args:
             repository: Repository name in format "owner/repo"
             limit: Maximum number of results to return
             order_by: Field to order by (default: "timestamp")
             descending: Sort in descending order (newest first)
+            filters: (field, op, value) conditions, e.g. ("critical_issues", ">", 0)
             
         Returns:
             List of CommitAudit objects
         """
+        audits = list(self.iter_by_repository(
+            repository, limit=limit, order_by=order_by,
+            descending=descending, filters=filters
+        ))
+        if not audits and not filters:
+            logger.warning(f"Repository not found: {repository}")
+        
+        logger.info(
+            f"Retrieved {len(audits)} commits for {repository} "
+            f"(limit={limit}, order_by={order_by}, filters={len(filters or ())})"
+        )
+        return audits
+    
+    def iter_by_repository(
+        self,
+        repository: str,
+        limit: Optional[int] = None,
+        order_by: str = "date",
+        descending: bool = True,
+        filters: Optional[List[Tuple[str, str, Any]]] = None
+    ) -> Iterator[CommitAudit]:
+        """Stream commit audits for a repository, parsing them one at a time.
+        
+        Same query as query_by_repository, but documents are decoded only as
+        the caller consumes them. A caller that stops early (e.g. after
+        finding one commit) skips parsing the rest and closes the stream.
+        
+        Args:
+            repository: Repository name in format "owner/repo"
+            limit: Maximum number of results to return
+            order_by: Field to order by (default: "date")
+            descending: Sort in descending order (newest first)
+            filters: (field, op, value) conditions, e.g. ("critical_issues", ">", 0)
+            
+        Yields:
+            CommitAudit objects in query order
+        """
         repo_id = self._get_repo_id(repository)
         repo_ref = self.client.collection(self.repositories_collection).document(repo_id)
         
-        # Check if repository exists
-        if not repo_ref.get().exists:
-            logger.warning(f"Repository not found: {repository}")
-            return []
+        # No existence check: a missing repository just has no commits, and
+        # skipping it saves a document read per query
         
         # Query commits subcollection
-        commits_ref = repo_ref.collection("commits")
-        query = commits_ref.order_by(
+        query = repo_ref.collection("commits")
+        for field_path, op, value in filters or ():
+            query = query.where(filter=FieldFilter(field_path, op, value))
+        query = query.order_by(
             order_by,
             direction=firestore.Query.DESCENDING if descending else firestore.Query.ASCENDING
         )
@@ -157,24 +348,11 @@ class FirestoreAuditDB:
         if limit:
             query = query.limit(limit)
         
-        # Execute query and convert to CommitAudit objects
-        docs = query.stream()
-        audits = []
-        
-        for doc in docs:
+        for doc in query.stream():
             try:
-                data = doc.to_dict()
-                audit = CommitAudit(**data)
-                audits.append(audit)
+                yield self._audit_from_document(doc.to_dict())
             except Exception as e:
                 logger.error(f"Failed to parse commit audit {doc.id}: {e}")
-                continue
-        
-        logger.info(
-            f"Retrieved {len(audits)} commits for {repository} "
-            f"(limit={limit}, order_by={order_by})"
-        )
-        return audits
     
     def query_with_filters(
         self,
@@ -221,10 +399,8 @@ class FirestoreAuditDB:
         repo_id = self._get_repo_id(repository)
         repo_ref = self.client.collection(self.repositories_collection).document(repo_id)
         
-        # Check if repository exists
-        if not repo_ref.get().exists:
-            logger.warning(f"Repository not found: {repository}")
-            return []
+        # No existence check: a missing repository just has no commits, and
+        # skipping it saves a document read per query
         
         # Build query with server-side filters
         commits_ref = repo_ref.collection("commits")
@@ -250,21 +426,27 @@ class FirestoreAuditDB:
         
         # Note: limit applied after client-side filtering
         
+        # Hash-based membership for the per-document client-side filters
+        author_set = frozenset(authors) if authors else None
+        file_set = frozenset(files) if files else None
+        
         # Execute query
         docs = query.stream()
         audits = []
+        scanned = 0
         
         for doc in docs:
+            scanned += 1
             try:
                 data = doc.to_dict()
                 
                 # Client-side filtering (always, to avoid Firestore composite index requirements)
-                if authors:
-                    if data.get("author") not in authors:
+                if author_set:
+                    if data.get("author") not in author_set:
                         continue
                 
-                if files:
-                    if not any(f in data.get("files_changed", []) for f in files):
+                if file_set:
+                    if file_set.isdisjoint(data.get("files_changed", ())):
                         continue
                 
                 if min_quality_score is not None:
@@ -275,7 +457,7 @@ class FirestoreAuditDB:
                     if data.get("security_score", 0) < min_security_score:
                         continue
                 
-                audit = CommitAudit(**data)
+                audit = self._audit_from_document(data)
                 audits.append(audit)
                 
                 # Apply limit after client-side filtering
@@ -286,6 +468,9 @@ class FirestoreAuditDB:
                 logger.error(f"Failed to parse commit audit {doc.id}: {e}")
                 continue
         
+        if not scanned and date_from is None and date_to is None:
+            logger.warning(f"Repository not found: {repository}")
+        
         filter_desc = []
         if authors:
             filter_desc.append(f"authors={len(authors)}")
@@ -334,30 +519,50 @@ class FirestoreAuditDB:
         repo_id = self._get_repo_id(repository)
         repo_ref = self.client.collection(self.repositories_collection).document(repo_id)
         
-        if not repo_ref.get().exists:
+        if not self._repo_exists(repo_ref):
             logger.warning(f"Repository not found for deletion: {repository}")
             return False
         
-        # Delete all commits in subcollection
+        # Delete all commits in subcollection; BulkWriter batches, retries
+        # and sends the deletes concurrently
         commits_ref = repo_ref.collection("commits")
-        batch = self.client.batch()
+        writer = self.client.bulk_writer()
         deleted_count = 0
         
-        for doc in commits_ref.stream():
-            batch.delete(doc.reference)
+        # Empty projection: only document references are needed
+        for doc in commits_ref.select([]).stream():
+            writer.delete(doc.reference)
             deleted_count += 1
-            
-            # Firestore batch limit is 500 operations
-            if deleted_count % 500 == 0:
-                batch.commit()
-                batch = self.client.batch()
+        writer.flush()
         
-        # Commit remaining deletions
-        if deleted_count % 500 != 0:
-            batch.commit()
-        
-        # Delete repository document
-        repo_ref.delete()
+        # Delete repository document once its commits are gone
+        writer.delete(repo_ref)
+        writer.close()
+        self._known_repo_ids.discard(repo_id)
         
         logger.info(f"Deleted repository {repository} with {deleted_count} commits")
         return True
+
+
+@lru_cache(maxsize=4)
+def get_audit_db(
+    project_id: Optional[str] = None,
+    database: str = "(default)",
+    collection_prefix: str = "quality-guardian"
+) -> FirestoreAuditDB:
+    """Return the process-wide FirestoreAuditDB for these settings.
+    
+    Tool calls share one client (and its gRPC channel, which is thread-safe)
+    instead of paying channel setup and TLS handshakes on every call.
+    
+    Args:
+        project_id: GCP project ID. If None, uses default from environment.
+        database: Firestore database ID. Default is "(default)".
+        collection_prefix: Prefix for collection names.
+        
+    Returns:
+        Shared FirestoreAuditDB instance
+    """
+    return FirestoreAuditDB(
+        project_id=project_id, database=database, collection_prefix=collection_prefix
+    )
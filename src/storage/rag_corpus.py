@@ -154,17 +154,17 @@ class RAGCorpusManager:
             logger.warning(f"Could not check for existing files: {e}")
 
         # 1. Store commit-level document (as before)
-        t0 = time.time()
+        t0 = time.perf_counter()
         audit_json = audit.model_dump_json(indent=2)
-        logger.debug(f"JSON serialization: {time.time() - t0:.3f}s")
+        logger.debug(f"JSON serialization: {time.perf_counter() - t0:.3f}s")
 
-        t0 = time.time()
+        t0 = time.perf_counter()
         commit_file = self._upload_json(
             json_content=audit_json,
             display_name=display_name,
             description=f"Commit audit: {audit.commit_sha[:7]} by {audit.author}",
         )
-        logger.info(f"Upload commit audit: {time.time() - t0:.3f}s")
+        logger.info(f"Upload commit audit: {time.perf_counter() - t0:.3f}s")
         uploaded_files['commit'] = commit_file
 
         # 2. Store per-file documents (NEW!)
@@ -407,7 +407,7 @@ class RAGCorpusManager:
         from google.cloud.aiplatform import utils
         
         # Get credentials with proper scopes
-        t0 = time.time()
+        t0 = time.perf_counter()
         credentials_path = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
         if credentials_path and os.path.exists(credentials_path):
             # Load service account with explicit scopes
@@ -420,10 +420,10 @@ class RAGCorpusManager:
             credentials, _ = google.auth.default(
                 scopes=["https://www.googleapis.com/auth/cloud-platform"]
             )
-        logger.debug(f"  → Load credentials: {time.time() - t0:.3f}s")
+        logger.debug(f"  → Load credentials: {time.perf_counter() - t0:.3f}s")
         
         # Build upload request (same as vertexai.rag.upload_file internals)
-        t0 = time.time()
+        t0 = time.perf_counter()
         location = initializer.global_config.location
         if not initializer.global_config.api_endpoint:
             request_endpoint = f"{location}-{aiplatform.constants.base.API_BASE_PATH}"
@@ -450,10 +450,10 @@ class RAGCorpusManager:
                     }
                 }
             }
-        logger.debug(f"  → Build request: {time.time() - t0:.3f}s")
+        logger.debug(f"  → Build request: {time.perf_counter() - t0:.3f}s")
         
         # Upload with scoped credentials
-        t0 = time.time()
+        t0 = time.perf_counter()
         files = {
             "metadata": (None, str(js_rag_file)),
             "file": open(path, "rb"),
@@ -461,9 +461,9 @@ class RAGCorpusManager:
         headers = {"X-Goog-Upload-Protocol": "multipart"}
         
         authorized_session = google_auth_requests.AuthorizedSession(credentials=credentials)
-        logger.debug(f"  → Prepare upload: {time.time() - t0:.3f}s")
+        logger.debug(f"  → Prepare upload: {time.perf_counter() - t0:.3f}s")
         
-        t0 = time.time()
+        t0 = time.perf_counter()
         try:
             response = authorized_session.post(
                 url=upload_request_uri,
@@ -471,7 +471,7 @@ class RAGCorpusManager:
                 headers=headers,
                 timeout=600,
             )
-            logger.info(f"  → HTTP POST upload: {time.time() - t0:.3f}s")
+            logger.info(f"  → HTTP POST upload: {time.perf_counter() - t0:.3f}s")
         except Exception as e:
             raise RuntimeError(f"Failed in uploading the RagFile: {e}") from e
         
@@ -80,6 +80,7 @@ def list_github_commits(
                 "files_changed": [f.filename for f in files],
                 "additions": commit.stats.additions,
                 "deletions": commit.stats.deletions,
+                "parents": [parent.sha for parent in commit.parents],
             })
         
         return {
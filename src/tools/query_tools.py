@@ -5,6 +5,7 @@ RAG is used only for semantic details (examples, code context).
 """
 import os
 import logging
+from bisect import bisect_right
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta, timezone
 
@@ -66,24 +67,22 @@ def _select_audit_sample(commits: list, start_date_str: str = None,
         point = baseline_dt + timedelta(seconds=i * interval)
         time_points.append(point)
     
-    # For each time point, find last commit BEFORE or AT that point
+    # For each time point, find last commit BEFORE or AT that point.
+    # Binary search over ascending dates; time points only move forward, so
+    # each search starts where the previous one ended (O(P log N), not O(P*N)).
+    oldest_first = commits[::-1]
+    dates = [c.date for c in oldest_first]
     selected = []
-    last_commit = None
+    lo = 0
     
     for time_point in time_points:
-        # Find commits at or before this time point (sorted newest to oldest)
-        candidates = [c for c in commits if c.date <= time_point]
-        
-        if candidates:
-            # Take most recent (first in list)
-            commit = candidates[0]
-            last_commit = commit
-        elif last_commit:
-            # No commit at this point → forward-fill from previous
-            commit = last_commit
-        else:
+        lo = bisect_right(dates, time_point, lo)
+        if lo == 0:
             # No commits before this point yet → skip
             continue
+        # Most recent commit at or before the point; once one exists, later
+        # points always find one too (forward-fill)
+        commit = oldest_first[lo - 1]
         
         # Avoid consecutive duplicates
         if not selected or selected[-1].commit_sha != commit.commit_sha:
@@ -173,14 +172,14 @@ def query_trends(
         to save token capacity. Agent analyzes aggregate metrics only.
     """
     try:
-        from storage.firestore_client import FirestoreAuditDB
+        from storage.firestore_client import get_audit_db
         
         # Initialize Firestore
         project = os.getenv("PROJECT_ID") or os.getenv("GOOGLE_CLOUD_PROJECT")
         if not project:
             return {"error": "Missing PROJECT_ID or GOOGLE_CLOUD_PROJECT"}
         
-        db = FirestoreAuditDB(
+        db = get_audit_db(
             project_id=project,
             database=os.getenv("FIRESTORE_DATABASE", "(default)"),
             collection_prefix=os.getenv("FIRESTORE_COLLECTION_PREFIX", "quality-guardian")
@@ -222,13 +221,9 @@ def query_trends(
                 "message": f"No commits found in {repo}. Database may be empty."
             }
         
-        # Parse dates if provided
-        start_dt = None
-        end_dt = None
-        if start_date:
-            start_dt = datetime.fromisoformat(start_date).replace(tzinfo=timezone.utc)
-        if end_date:
-            end_dt = datetime.fromisoformat(end_date).replace(tzinfo=timezone.utc)
+        # Reuse the dates parsed for the query above
+        start_dt = date_from_dt
+        end_dt = date_to_dt
         
         # Filter commits by date range (keep commits in range + one before for baseline)
         if start_dt or end_dt:
@@ -272,6 +267,7 @@ def query_trends(
         sample_commits = _select_audit_sample(commits, start_date, end_date, max_points=20)
         
         # Build sample data for agent
+        file_set = frozenset(files) if files else None
         sample = []
         for i, commit in enumerate(sample_commits):
             # Determine label
@@ -299,8 +295,8 @@ def query_trends(
             }
             
             # Add file count if file filtering was used
-            if files:
-                sample_data["files_in_scope"] = len([f for f in commit.files_changed if f in files])
+            if file_set:
+                sample_data["files_in_scope"] = sum(1 for f in commit.files_changed if f in file_set)
             
             sample.append(sample_data)
         
@@ -308,9 +304,8 @@ def query_trends(
         period_start = sample[0]["date"][:10]  # ISO date only
         period_end = sample[-1]["date"][:10]
         
-        period_start_dt = datetime.fromisoformat(sample[0]["date"])
-        period_end_dt = datetime.fromisoformat(sample[-1]["date"])
-        days = (period_end_dt - period_start_dt).days
+        # Sample dates were serialized from these datetimes; don't re-parse them
+        days = (sample_commits[-1].date - sample_commits[0].date).days
         
         result = {
             "status": "success",
@@ -7,10 +7,11 @@ These tools allow agents to perform complex analysis in multiple steps:
 
 This enables file-specific trend analysis and flexible workflows.
 """
-import os
+import functools
 import logging
-from typing import Dict, List, Any, Optional
+import os
 from datetime import datetime, timezone
+from typing import Callable, Dict, FrozenSet, List, Any, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -54,9 +55,9 @@ def filter_commits(
         -> Returns list of matching SHAs
     """
     try:
-        from storage.firestore_client import FirestoreAuditDB
+        from storage.firestore_client import get_audit_db
         
-        db = FirestoreAuditDB()
+        db = get_audit_db()
         
         # Parse dates if provided
         date_from_dt = None
@@ -127,6 +128,71 @@ def filter_commits(
         }
 
 
+def _repository_row(sha: str, commit) -> Dict[str, Any]:
+    """Repository-level metrics row for get_commit_details(scope="repository")."""
+    return {
+        "sha": sha,
+        "date": commit.date.isoformat(),
+        "author": commit.author,
+        "quality_score": round(commit.quality_score, 1),
+        "security_score": round(commit.security_score, 1) if hasattr(commit, 'security_score') else None,
+        "complexity_score": round(commit.avg_complexity, 1) if hasattr(commit, 'avg_complexity') else None,
+        "total_issues": commit.total_issues,
+        "critical_issues": commit.critical_issues if hasattr(commit, 'critical_issues') else 0,
+        "high_issues": commit.high_issues if hasattr(commit, 'high_issues') else 0
+    }
+
+
+@functools.lru_cache(maxsize=32)
+def _get_row_builder(scope: str, files: Optional[FrozenSet[str]]) -> Callable:
+    """Return a row builder specialized for a (scope, files) shape.
+
+    The trends agent calls get_commit_details repeatedly with the same
+    scope and file list, so the specialized closure is built once and reused.
+    Builders return None for commits that should be skipped.
+    """
+    if scope == "repository":
+        return _repository_row
+    
+    def file_row(sha: str, commit) -> Optional[Dict[str, Any]]:
+        # Aggregate file-level metrics (inline, no DB query)
+        # Check if commit has file-level data
+        if not hasattr(commit, 'files') or not commit.files:
+            logger.warning(f"No file-level data for commit {sha}, using repo metrics")
+            return {
+                "sha": sha,
+                "date": commit.date.isoformat(),
+                "author": commit.author,
+                "quality_score": round(commit.quality_score, 1),
+                "security_score": round(commit.security_score, 1) if hasattr(commit, 'security_score') else None,
+                "total_issues": commit.total_issues,
+                "files_analyzed": []
+            }
+        
+        # Filter to requested files (set membership)
+        matching_files = [f for f in commit.files if f.file_path in files]
+        
+        if not matching_files:
+            return None
+        
+        # Calculate averages
+        avg_quality = sum(f.quality_score for f in matching_files) / len(matching_files)
+        avg_security = sum(f.security_score for f in matching_files if hasattr(f, 'security_score')) / len(matching_files)
+        total_issues_sum = sum(f.total_issues for f in matching_files if hasattr(f, 'total_issues'))
+        
+        return {
+            "sha": sha,
+            "date": commit.date.isoformat(),
+            "author": commit.author,
+            "quality_score": round(avg_quality, 1),
+            "security_score": round(avg_security, 1),
+            "total_issues": total_issues_sum,
+            "files_analyzed": [f.file_path for f in matching_files]
+        }
+    
+    return file_row
+
+
 def get_commit_details(
     repo: str,
     commit_shas: list,
@@ -167,19 +233,19 @@ def get_commit_details(
         -> Returns file-specific metrics for those commits
     """
     try:
-        from storage.firestore_client import FirestoreAuditDB
-        
-        db = FirestoreAuditDB()
+        from storage.firestore_client import get_audit_db
         
-        # Fetch all commits matching SHAs
-        all_commits = db.query_by_repository(repository=repo, limit=1000)
+        db = get_audit_db()
         
-        # Filter to requested SHAs
+        # Stream commits, stopping once every requested SHA is found
+        wanted = set(commit_shas)
         commits_map = {}
-        for c in all_commits:
+        for c in db.iter_by_repository(repository=repo, limit=1000):
             short_sha = c.commit_sha[:7]
-            if short_sha in commit_shas or c.commit_sha in commit_shas:
+            if short_sha in wanted or c.commit_sha in wanted:
                 commits_map[short_sha] = c
+                if len(commits_map) == len(wanted):
+                    break
         
         if not commits_map:
             return {
@@ -187,77 +253,31 @@ def get_commit_details(
                 "message": f"No commits found with SHAs: {commit_shas}"
             }
         
+        # Validate scope once and bind the per-commit row builder up front,
+        # so the loop below does no scope/files dispatch per commit
+        if scope == "files" and not files:
+            return {
+                "status": "error",
+                "message": "scope='files' requires 'files' parameter"
+            }
+        if scope not in ("repository", "files"):
+            return {
+                "status": "error",
+                "message": f"Invalid scope: {scope}. Use 'repository' or 'files'."
+            }
+        build_row = _get_row_builder(scope, frozenset(files) if scope == "files" else None)
+        
         # Build response based on scope
         commits_data = []
         
         for sha in commit_shas:
-            if sha not in commits_map:
+            commit = commits_map.get(sha)
+            if commit is None:
                 continue
             
-            commit = commits_map[sha]
-            
-            if scope == "repository":
-                # Return repository-level metrics
-                commit_data = {
-                    "sha": sha,
-                    "date": commit.date.isoformat(),
-                    "author": commit.author,
-                    "quality_score": round(commit.quality_score, 1),
-                    "security_score": round(commit.security_score, 1) if hasattr(commit, 'security_score') else None,
-                    "complexity_score": round(commit.avg_complexity, 1) if hasattr(commit, 'avg_complexity') else None,
-                    "total_issues": commit.total_issues,
-                    "critical_issues": commit.critical_issues if hasattr(commit, 'critical_issues') else 0,
-                    "high_issues": commit.high_issues if hasattr(commit, 'high_issues') else 0
-                }
-                
-            elif scope == "files":
-                # Aggregate file-level metrics (inline, no DB query)
-                if not files:
-                    # No files specified - return error
-                    return {
-                        "status": "error",
-                        "message": "scope='files' requires 'files' parameter"
-                    }
-                
-                # Check if commit has file-level data
-                if not hasattr(commit, 'files') or not commit.files:
-                    logger.warning(f"No file-level data for commit {sha}, using repo metrics")
-                    commit_data = {
-                        "sha": sha,
-                        "date": commit.date.isoformat(),
-                        "author": commit.author,
-                        "quality_score": round(commit.quality_score, 1),
-                        "security_score": round(commit.security_score, 1) if hasattr(commit, 'security_score') else None,
-                        "total_issues": commit.total_issues,
-                        "files_analyzed": []
-                    }
-                else:
-                    # Filter to requested files
-                    matching_files = [f for f in commit.files if f.file_path in files]
-                    
-                    if not matching_files:
-                        continue  # Skip commits without matching files
-                    
-                    # Calculate averages
-                    avg_quality = sum(f.quality_score for f in matching_files) / len(matching_files)
-                    avg_security = sum(f.security_score for f in matching_files if hasattr(f, 'security_score')) / len(matching_files)
-                    total_issues_sum = sum(f.total_issues for f in matching_files if hasattr(f, 'total_issues'))
-                    
-                    commit_data = {
-                        "sha": sha,
-                        "date": commit.date.isoformat(),
-                        "author": commit.author,
-                        "quality_score": round(avg_quality, 1),
-                        "security_score": round(avg_security, 1),
-                        "total_issues": total_issues_sum,
-                        "files_analyzed": [f.file_path for f in matching_files]
-                    }
-            
-            else:
-                return {
-                    "status": "error",
-                    "message": f"Invalid scope: {scope}. Use 'repository' or 'files'."
-                }
+            commit_data = build_row(sha, commit)
+            if commit_data is None:
+                continue  # Skip commits without matching files
             
             commits_data.append(commit_data)
         
@@ -303,14 +323,13 @@ def aggregate_file_metrics(
         }
     """
     try:
-        from storage.firestore_client import FirestoreAuditDB
+        from storage.firestore_client import get_audit_db
         
-        db = FirestoreAuditDB()
+        db = get_audit_db()
         
-        # Fetch commit
-        commits = db.query_by_repository(repository=repo, limit=1000)
+        # Stream commits; the break below skips parsing the rest
         commit = None
-        for c in commits:
+        for c in db.iter_by_repository(repository=repo, limit=1000):
             if c.commit_sha.startswith(commit_sha) or c.commit_sha[:7] == commit_sha:
                 commit = c
                 break
@@ -4,16 +4,9 @@ These tools use Vertex AI RAG Corpus for semantic search across commit audits.
 Unlike Firestore queries (structured), RAG provides semantic similarity matching.
 """
 import logging
-import sys
-from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
-# Add parent directory to path for imports
-src_path = Path(__file__).parent.parent
-if str(src_path) not in sys.path:
-    sys.path.insert(0, str(src_path))
-
 logger = logging.getLogger(__name__)
 
 
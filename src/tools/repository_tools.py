@@ -55,6 +55,16 @@ def _get_rag_tool():
     return rag_mgr, rag_tool, stats
 
 
+def _use_blob_api() -> bool:
+    """Whether audits read files through the GitHub tree/blob API.
+    
+    Set AUDIT_USE_BLOB_API=true where cloning is unavailable or slow. Off by
+    default: the API path spends rate-limited requests on every commit,
+    while a clone spends none.
+    """
+    return os.getenv("AUDIT_USE_BLOB_API", "false").lower() in ("1", "true", "yes")
+
+
 def analyze_repository(repo: str, count: int = 10) -> dict:
     """
     Analyze recent commits from a GitHub repository for quality issues.
@@ -114,20 +124,21 @@ def analyze_repository(repo: str, count: int = 10) -> dict:
                 date=datetime.fromisoformat(c["date"]),
                 files_changed=c["files_changed"],
                 additions=c["additions"],
-                deletions=c["deletions"]
+                deletions=c["deletions"],
+                parents=c.get("parents", []),
             ))
         
         logger.info(f"Analyzing {len(commits)} commits from {repo}...")
         
         # Initialize engine and storage
         connector = GitHubConnector(token=token)
-        engine = AuditEngine(connector=connector)
+        engine = AuditEngine(connector=connector, use_blob_api=_use_blob_api())
         rag = RAGCorpusManager(corpus_name="quality-guardian-audits")
         rag.initialize_corpus()
         
         # Initialize Firestore (primary storage)
-        from storage.firestore_client import FirestoreAuditDB
-        firestore_db = FirestoreAuditDB(
+        from storage.firestore_client import get_audit_db
+        firestore_db = get_audit_db(
             project_id=project,
             database=os.getenv("FIRESTORE_DATABASE", "(default)"),
             collection_prefix=os.getenv("FIRESTORE_COLLECTION_PREFIX", "quality-guardian")
@@ -137,24 +148,24 @@ def analyze_repository(repo: str, count: int = 10) -> dict:
         total_issues = 0
         quality_scores = []
         
-        for commit in commits:
-            audit = engine.audit_commit(repo, commit)
+        # Oldest-first, so each commit only re-analyzes files changed since its parent
+        for audit in engine.audit_commits(repo, commits):
             
             # Primary write: Firestore (source of truth)
             try:
                 firestore_db.store_commit_audit(audit)
-                logger.debug(f"✓ Stored in Firestore: {commit.sha[:7]}")
+                logger.debug(f"✓ Stored in Firestore: {audit.commit_sha[:7]}")
             except Exception as e:
-                logger.error(f"✗ Firestore write failed for {commit.sha[:7]}: {e}")
+                logger.error(f"✗ Firestore write failed for {audit.commit_sha[:7]}: {e}")
                 # Don't fail - continue to RAG
             
             # Secondary write: RAG (semantic search cache, best-effort)
             try:
-                display_name = f"{repo.replace('/', '_')}_commit_{commit.sha[:7]}.json"
+                display_name = f"{repo.replace('/', '_')}_commit_{audit.commit_sha[:7]}.json"
                 rag.store_commit_audit(audit, display_name=display_name)
-                logger.debug(f"✓ Stored in RAG: {commit.sha[:7]}")
+                logger.debug(f"✓ Stored in RAG: {audit.commit_sha[:7]}")
             except Exception as e:
-                logger.warning(f"RAG write failed for {commit.sha[:7]}: {e}", exc_info=True)
+                logger.warning(f"RAG write failed for {audit.commit_sha[:7]}: {e}", exc_info=True)
                 # Continue - RAG is optional cache
             
             total_issues += audit.total_issues
@@ -204,13 +215,13 @@ def check_new_commits(repo: str) -> dict:
         location = os.getenv("VERTEX_LOCATION", "us-west1")
         vertexai.init(project=project, location=location)
         connector = GitHubConnector(token=token)
-        engine = AuditEngine(connector=connector)
+        engine = AuditEngine(connector=connector, use_blob_api=_use_blob_api())
         rag = RAGCorpusManager(corpus_name="quality-guardian-audits")
         rag.initialize_corpus()
         
         # Get last analyzed commit from Firestore (deterministic storage)
-        from storage.firestore_client import FirestoreAuditDB
-        firestore_db = FirestoreAuditDB(
+        from storage.firestore_client import get_audit_db
+        firestore_db = get_audit_db(
             project_id=project,
             database=os.getenv("FIRESTORE_DATABASE", "(default)"),
             collection_prefix=os.getenv("FIRESTORE_COLLECTION_PREFIX", "quality-guardian")
@@ -218,8 +229,8 @@ def check_new_commits(repo: str) -> dict:
         last_audits = firestore_db.query_by_repository(repo, limit=1, order_by="date", descending=True)
         last_sha = last_audits[0].commit_sha if last_audits else None
         
-        # Get all commits
-        commits = connector.list_commits(repo)
+        # Walk commits lazily: details are only fetched for commits newer than last_sha
+        commits = connector.iter_commits(repo)
         
         # Find new commits
         new_commits = []
@@ -237,8 +248,8 @@ def check_new_commits(repo: str) -> dict:
         logger.info(f"Found {len(new_commits)} new commits in {repo}")
         
         # Initialize Firestore (primary storage)
-        from storage.firestore_client import FirestoreAuditDB
-        firestore_db = FirestoreAuditDB(
+        from storage.firestore_client import get_audit_db
+        firestore_db = get_audit_db(
             project_id=project,
             database=os.getenv("FIRESTORE_DATABASE", "(default)"),
             collection_prefix=os.getenv("FIRESTORE_COLLECTION_PREFIX", "quality-guardian")
@@ -248,23 +259,24 @@ def check_new_commits(repo: str) -> dict:
         total_issues = 0
         quality_scores = []
         
-        for commit in new_commits:
-            audit = engine.audit_commit(repo, commit)
+        # Build on the last stored audit: only files touched by new commits are re-analyzed
+        previous = last_audits[0] if last_audits else None
+        for audit in engine.audit_commits(repo, new_commits, previous=previous):
             
             # Primary write: Firestore (source of truth)
             try:
                 firestore_db.store_commit_audit(audit)
-                logger.debug(f"Stored in Firestore: {commit.sha[:7]}")
+                logger.debug(f"Stored in Firestore: {audit.commit_sha[:7]}")
             except Exception as e:
-                logger.error(f"Firestore write failed for {commit.sha[:7]}: {e}")
+                logger.error(f"Firestore write failed for {audit.commit_sha[:7]}: {e}")
             
             # Secondary write: RAG (semantic search cache, best-effort)
             try:
-                display_name = f"{repo.replace('/', '_')}_commit_{commit.sha[:7]}.json"
+                display_name = f"{repo.replace('/', '_')}_commit_{audit.commit_sha[:7]}.json"
                 rag.store_commit_audit(audit, display_name=display_name)
-                logger.debug(f"Stored in RAG: {commit.sha[:7]}")
+                logger.debug(f"Stored in RAG: {audit.commit_sha[:7]}")
             except Exception as e:
-                logger.warning(f"RAG write failed for {commit.sha[:7]}: {e}", exc_info=True)
+                logger.warning(f"RAG write failed for {audit.commit_sha[:7]}: {e}", exc_info=True)
             
             total_issues += audit.total_issues
             quality_scores.append(audit.quality_score)
@@ -309,7 +321,7 @@ def query_trends(repo: str, question: str) -> dict:
     try:
         import warnings
         from vertexai.generative_models import GenerativeModel
-        from storage.firestore_client import FirestoreAuditDB
+        from storage.firestore_client import get_audit_db
         import vertexai
         
         # Suppress deprecation warning - Vertex RAG not yet in google.genai
@@ -321,7 +333,7 @@ def query_trends(repo: str, question: str) -> dict:
         vertexai.init(project=project, location=location)
         
         # Get commits from Firestore (primary source)
-        db = FirestoreAuditDB(
+        db = get_audit_db(
             project_id=project,
             database=os.getenv("FIRESTORE_DATABASE", "(default)"),
             collection_prefix=os.getenv("FIRESTORE_COLLECTION_PREFIX", "quality-guardian")
@@ -443,7 +455,7 @@ def list_analyzed_repositories() -> dict:
         List of repositories with analysis stats
     """
     try:
-        from storage.firestore_client import FirestoreAuditDB
+        from storage.firestore_client import get_audit_db
         import vertexai
         
         # Get project from env (PROJECT_ID works in Agent Engine, GOOGLE_CLOUD_PROJECT locally)
@@ -455,7 +467,7 @@ def list_analyzed_repositories() -> dict:
         vertexai.init(project=project, location=location)
         
         # Read from Firestore (primary storage)
-        firestore_db = FirestoreAuditDB(
+        firestore_db = get_audit_db(
             project_id=project,
             database=os.getenv("FIRESTORE_DATABASE", "(default)"),
             collection_prefix=os.getenv("FIRESTORE_COLLECTION_PREFIX", "quality-guardian")
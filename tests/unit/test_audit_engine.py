@@ -1,14 +1,16 @@
 """Tests for audit engine."""
 
 import tempfile
+from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
 
+from audit_models import FileAudit
 from src.audit.engine import AuditEngine
-from src.connectors.base import CommitInfo, RepositoryInfo
+from src.connectors.base import CommitInfo, RepositoryInfo, TreeEntry
 
 
 @pytest.fixture
@@ -158,6 +160,135 @@ def test_find_python_files_excludes_common_dirs(audit_engine, tmp_path):
     assert files[0].name == "main.py"
 
 
+def test_audit_files_parallel_matches_sequential(mock_connector, sample_repo_with_code):
+    """Test process-pool file analysis returns the same audits in order."""
+    files = AuditEngine(connector=mock_connector)._find_python_files(str(sample_repo_with_code))
+
+    sequential = AuditEngine(connector=mock_connector, max_workers=1)._audit_files(
+        files, str(sample_repo_with_code)
+    )
+    parallel = AuditEngine(connector=mock_connector, max_workers=2)._audit_files(
+        files, str(sample_repo_with_code)
+    )
+
+    assert len(files) >= 4  # Large enough to use the pool
+    assert [f.model_dump() for f in parallel] == [f.model_dump() for f in sequential]
+
+
+def test_audit_files_reuses_unchanged_content(mock_connector, sample_repo_with_code):
+    """Test unchanged files are served from the content cache on re-audit."""
+    engine = AuditEngine(connector=mock_connector, max_workers=1)
+    files = engine._find_python_files(str(sample_repo_with_code))
+    first = engine._audit_files(files, str(sample_repo_with_code))
+
+    files[0].write_text(files[0].read_text() + "\nx = 1\n")
+    with patch.object(engine, "_audit_code", wraps=engine._audit_code) as audit_code:
+        second = engine._audit_files(files, str(sample_repo_with_code))
+
+    assert audit_code.call_count == 1  # Only the modified file is re-analyzed
+    assert second[1:] == first[1:]
+
+
+def test_audit_files_cache_disabled(mock_connector, sample_repo_with_code):
+    """Test cache_file_audits=False re-analyzes every file."""
+    engine = AuditEngine(connector=mock_connector, max_workers=1, cache_file_audits=False)
+    files = engine._find_python_files(str(sample_repo_with_code))
+    engine._audit_files(files, str(sample_repo_with_code))
+
+    with patch.object(engine, "_audit_code", wraps=engine._audit_code) as audit_code:
+        engine._audit_files(files, str(sample_repo_with_code))
+
+    assert audit_code.call_count == len(files)
+
+
+def test_build_commit_audit_aggregates_files(audit_engine, sample_commit):
+    """Test commit-level counts and scores are aggregated from file audits."""
+    files = [
+        FileAudit(
+            file_path="a.py",
+            security_issues=[{"severity": "critical"}, {"severity": "high"}],
+            complexity_issues=[{"severity": "medium"}],
+            avg_complexity=4.0,
+            max_complexity=6.0,
+            function_count=2,
+            critical_issues=1,
+            high_issues=1,
+            medium_issues=1,
+        ),
+        FileAudit(
+            file_path="b.py",
+            security_issues=[{"severity": "low"}],
+            complexity_issues=[{"severity": "high"}],
+            avg_complexity=10.0,
+            max_complexity=12.0,
+            function_count=1,
+            high_issues=1,
+            low_issues=1,
+        ),
+    ]
+
+    audit = audit_engine._build_commit_audit("owner/repo", sample_commit, files)
+
+    assert audit.total_issues == 5
+    assert (audit.critical_issues, audit.high_issues) == (1, 2)
+    assert (audit.medium_issues, audit.low_issues) == (1, 1)
+    assert audit.max_complexity == 12.0
+    assert abs(audit.avg_complexity - 6.0) < 0.01
+    # critical=20, high=10, low=1 -> 100 - 31 = 69
+    assert abs(audit.security_score - 69.0) < 0.01
+    # Built without validation, but must round-trip through it unchanged
+    assert type(audit).model_validate(audit.model_dump()) == audit
+
+
+def test_audit_code_lines_of_code(audit_engine):
+    """Test line counting with and without a trailing newline."""
+    assert audit_engine._audit_code("x = 1\ny = 2\n", "a.py").lines_of_code == 2
+    assert audit_engine._audit_code("x = 1\ny = 2", "a.py").lines_of_code == 2
+    assert audit_engine._audit_code("", "a.py").lines_of_code == 0
+
+
+@pytest.mark.parametrize("separator", ["\r", "\r\n", "\x0c", "\x1c", "\x1e", "\u2028"])
+def test_audit_code_lines_of_code_matches_splitlines(audit_engine, separator):
+    """Test lines_of_code follows str.splitlines() for every line boundary."""
+    code = f"# a{separator}b\ny = 2\n"
+
+    assert audit_engine._audit_code(code, "a.py").lines_of_code == len(code.splitlines())
+
+
+@patch("src.audit.engine.detect_security_issues")
+def test_audit_code_normalizes_bandit_severity(mock_detect, audit_engine):
+    """Test Bandit's upper-case severities map to canonical lower-case ones."""
+    mock_detect.return_value = Mock(issues=[
+        Mock(issue_severity="HIGH", issue_text="eval", line_number=1, test_id="B307", cwe_id=78),
+        Mock(issue_severity="UNDEFINED", issue_text="?", line_number=2, test_id="B000", cwe_id=None),
+    ])
+
+    file_audit = audit_engine._audit_code("x = 1\n", "a.py")
+
+    assert [i["severity"] for i in file_audit.security_issues] == ["high", "undefined"]
+    assert file_audit.security_issues[0] == {
+        "type": "security",
+        "severity": "high",
+        "message": "eval",
+        "line": 1,
+        "file": "a.py",
+        "test_id": "B307",
+        "cwe_id": 78,
+    }
+    assert file_audit.high_issues == 1
+
+
+def test_audit_files_skips_oversized(mock_connector, tmp_path):
+    """Test files above max_file_bytes are left out of the audit."""
+    (tmp_path / "small.py").write_text("x = 1\n")
+    (tmp_path / "generated_pb2.py").write_text("x = 1\n" * 100)
+    engine = AuditEngine(connector=mock_connector, max_workers=1, max_file_bytes=50)
+
+    file_audits = engine._audit_files(engine._find_python_files(str(tmp_path)), str(tmp_path))
+
+    assert [f.file_path for f in file_audits] == ["small.py"]
+
+
 def test_calculate_security_score_no_issues(audit_engine):
     """Test security score with no issues."""
     score = audit_engine._calculate_security_score([])
@@ -179,6 +310,17 @@ def test_calculate_security_score_with_issues(audit_engine):
     assert abs(score - 64.0) < 0.01
 
 
+def test_security_score_from_counts(audit_engine):
+    """Test security score computed from pre-counted severities."""
+    score = audit_engine._security_score_from_counts(
+        {"critical": 1, "high": 2, "medium": 0, "low": 3}
+    )
+
+    # 20 + 2*10 + 3*1 = 43 -> 57
+    assert abs(score - 57.0) < 0.01
+    assert audit_engine._security_score_from_counts({"critical": 10}) == 0.0
+
+
 def test_calculate_quality_score_perfect(audit_engine):
     """Test quality score calculation with perfect metrics."""
     score = audit_engine._calculate_quality_score(
@@ -277,3 +419,224 @@ def test_audit_commit_integration(
 
     # Should count issues
     assert audit.total_issues > 0
+    assert audit.processing_time > 0
+
+
+def test_audit_commit_via_blob_api(mock_connector, sample_commit):
+    """Test auditing through the tree/blob API without cloning."""
+    mock_connector.list_tree.return_value = [
+        TreeEntry(path="src/utils.py", sha="blob1", size=30),
+        TreeEntry(path="venv/site.py", sha="blob2", size=10),
+        TreeEntry(path="README.md", sha="blob3", size=10),
+    ]
+    mock_connector.get_blob.return_value = b"def simple_function():\n    return 1\n"
+    engine = AuditEngine(connector=mock_connector, use_blob_api=True)
+
+    audit = engine.audit_commit("test-owner/test-repo", sample_commit)
+
+    assert [f.file_path for f in audit.files] == ["src/utils.py"]
+    mock_connector.clone_repository.assert_not_called()
+
+    # Same blob at the next commit is served from cache
+    engine.audit_commit("test-owner/test-repo", sample_commit)
+    assert mock_connector.get_blob.call_count == 1
+
+
+def test_audit_commit_incremental_reuses_unchanged_files(mock_connector, sample_commit):
+    """Test only changed files are fetched; deleted files drop out."""
+    mock_connector.list_tree.return_value = [
+        TreeEntry(path="a.py", sha="blob-a", size=10),
+        TreeEntry(path="b.py", sha="blob-b", size=10),
+        TreeEntry(path="c.py", sha="blob-c", size=10),
+        TreeEntry(path="d.py", sha="blob-d", size=10),
+    ]
+    mock_connector.get_blob.return_value = b"x = 1\n"
+    engine = AuditEngine(connector=mock_connector, use_blob_api=True)
+    parent = engine.audit_commit("test-owner/test-repo", sample_commit)
+    mock_connector.get_blob.reset_mock()
+
+    child = CommitInfo(
+        sha="def456",
+        message="Edit b, add e, delete d",
+        author="Test Author",
+        author_email="test@example.com",
+        date=datetime(2024, 11, 21),
+        files_changed=["b.py", "d.py", "e.py"],
+        additions=2,
+        deletions=1,
+        parents=["abc123"],
+    )
+    trees = {
+        "abc123": mock_connector.list_tree.return_value,
+        "def456": [
+            TreeEntry(path="a.py", sha="blob-a", size=10),
+            TreeEntry(path="b.py", sha="blob-b2", size=12),
+            TreeEntry(path="c.py", sha="blob-c", size=10),
+            TreeEntry(path="e.py", sha="blob-e", size=10),
+        ],
+    }
+    mock_connector.list_tree.side_effect = lambda repo, sha: trees[sha]
+
+    audit = engine.audit_commit_incremental("test-owner/test-repo", child, parent)
+
+    assert [f.file_path for f in audit.files] == ["a.py", "b.py", "c.py", "e.py"]
+    assert audit.files[0] is parent.files[0]
+    fetched = sorted(c.args[1] for c in mock_connector.get_blob.call_args_list)
+    assert fetched == ["blob-b2", "blob-e"]
+
+
+@pytest.mark.parametrize("files_changed", [[], ["a.py"]])
+def test_audit_commit_incremental_compares_blob_shas(
+    mock_connector, sample_commit, files_changed
+):
+    """Test reuse follows tree blob SHAs, not a missing or partial file list."""
+    trees = {
+        "abc123": [
+            TreeEntry(path="a.py", sha="blob-a", size=10),
+            TreeEntry(path="b.py", sha="blob-b", size=10),
+        ],
+        "def456": [
+            TreeEntry(path="a.py", sha="blob-a2", size=10),
+            TreeEntry(path="b.py", sha="blob-b2", size=12),
+        ],
+    }
+    mock_connector.list_tree.side_effect = lambda repo, sha: trees[sha]
+    mock_connector.get_blob.return_value = b"x = 1\n"
+    parent = AuditEngine(connector=mock_connector, use_blob_api=True).audit_commit(
+        "test-owner/test-repo", sample_commit
+    )
+    mock_connector.get_blob.reset_mock()
+
+    child = CommitInfo(
+        sha="def456",
+        message="Edit a and b",
+        author="Test Author",
+        author_email="test@example.com",
+        date=datetime(2024, 11, 21),
+        files_changed=files_changed,
+        additions=2,
+        deletions=2,
+        parents=["abc123"],
+    )
+    engine = AuditEngine(connector=mock_connector, use_blob_api=True)
+    audit = engine.audit_commit_incremental("test-owner/test-repo", child, parent)
+
+    assert all(f is not p for f, p in zip(audit.files, parent.files))
+    fetched = sorted(c.args[1] for c in mock_connector.get_blob.call_args_list)
+    assert fetched == ["blob-a2", "blob-b2"]
+
+
+def test_audit_commit_incremental_via_clone(mock_connector, sample_commit, tmp_path):
+    """Test clone-mode incremental audits diff locally and call no API."""
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "a.py").write_text("x = 1\n")
+    (tmp_path / "b.py").write_text("y = 2\n")
+    parent = AuditEngine(connector=mock_connector, max_workers=1).audit_commit(
+        "test-owner/test-repo", sample_commit, str(tmp_path)
+    )
+    (tmp_path / "b.py").write_text("y = 3\n")
+    (tmp_path / "c.py").write_text("z = 4\n")
+    mock_connector.changed_files.return_value = ["b.py", "c.py"]
+    child = CommitInfo(
+        **{**asdict(sample_commit), "sha": "def456", "files_changed": [], "parents": ["abc123"]}
+    )
+    engine = AuditEngine(connector=mock_connector, max_workers=1)
+
+    with patch.object(engine, "_audit_code", wraps=engine._audit_code) as audit_code:
+        audit = engine.audit_commit_incremental(
+            "test-owner/test-repo", child, parent, str(tmp_path)
+        )
+
+    files = {f.file_path: f for f in audit.files}
+    assert sorted(files) == ["a.py", "b.py", "c.py"]
+    assert files["a.py"] is next(f for f in parent.files if f.file_path == "a.py")
+    assert sorted(c.args[1] for c in audit_code.call_args_list) == ["b.py", "c.py"]
+    mock_connector.changed_files.assert_called_once_with(str(tmp_path), "abc123", "def456")
+    mock_connector.list_tree.assert_not_called()
+    mock_connector.get_blob.assert_not_called()
+
+
+def test_audit_commits_full_audit_without_parent_link(mock_connector, sample_commit):
+    """Test commits not descending from the previous audit get a full audit."""
+    engine = AuditEngine(connector=mock_connector)
+    previous = Mock(commit_sha="unrelated")
+
+    with patch.object(engine, "audit_commit") as audit_commit:
+        audits = list(engine.audit_commits("test-owner/test-repo", [sample_commit], previous))
+
+    audit_commit.assert_called_once()
+    assert audit_commit.call_args.args[:2] == ("test-owner/test-repo", sample_commit)
+    assert audits == [audit_commit.return_value]
+
+
+def test_audit_commits_reuses_one_clone(mock_connector, sample_commit):
+    """Test full audits share a single clone, switched with checkout_commit."""
+    def fake_clone(repo_identifier, target_path, sha=None):
+        (Path(target_path) / ".git").mkdir()
+        (Path(target_path) / "app.py").write_text("x = 1\n")
+        return target_path
+
+    mock_connector.clone_repository.side_effect = fake_clone
+    later_commit = CommitInfo(
+        sha="fff999",
+        message="Unrelated history",
+        author="Test Author",
+        author_email="test@example.com",
+        date=datetime(2024, 11, 22),
+        files_changed=["app.py"],
+        additions=1,
+        deletions=0,
+        parents=["not-audited"],
+    )
+    engine = AuditEngine(connector=mock_connector, max_workers=1)
+
+    audits = list(engine.audit_commits("test-owner/test-repo", [later_commit, sample_commit]))
+
+    assert [a.commit_sha for a in audits] == ["abc123", "fff999"]
+    mock_connector.clone_repository.assert_called_once()
+    mock_connector.checkout_commit.assert_called_once()
+    assert mock_connector.checkout_commit.call_args.args[1] == "fff999"
+
+
+def test_audit_commits_shares_one_process_pool(mock_connector, sample_commit):
+    """Test one analysis pool serves every commit of an audit_commits run."""
+    later_commit = CommitInfo(
+        **{**asdict(sample_commit), "sha": "fff999", "date": datetime(2024, 11, 22)}
+    )
+    engine = AuditEngine(connector=mock_connector, max_workers=2)
+
+    with patch.object(engine, "_process_pool") as process_pool, \
+            patch.object(engine, "audit_commit") as audit_commit:
+        list(engine.audit_commits("test-owner/test-repo", [sample_commit, later_commit]))
+
+    process_pool.assert_called_once_with()
+    pool = process_pool.return_value.__enter__.return_value
+    assert audit_commit.call_count == 2
+    assert all(c.kwargs["executor"] is pool for c in audit_commit.call_args_list)
+
+
+def test_process_pool_does_not_fork(mock_connector):
+    """Test analysis workers use a fork-safe start method."""
+    engine = AuditEngine(connector=mock_connector, max_workers=2)
+
+    with patch("src.audit.engine.ProcessPoolExecutor") as executor_cls:
+        engine._process_pool()
+
+    mp_context = executor_cls.call_args.kwargs["mp_context"]
+    assert mp_context.get_start_method() in ("forkserver", "spawn")
+
+
+@patch("src.audit.engine.tempfile.TemporaryDirectory")
+def test_audit_commit_blob_api_falls_back_to_clone(
+    mock_temp_dir, mock_connector, sample_commit, sample_repo_with_code
+):
+    """Test API failures fall back to cloning."""
+    mock_temp_dir.return_value.__enter__.return_value = str(sample_repo_with_code)
+    mock_connector.clone_repository.return_value = str(sample_repo_with_code)
+    mock_connector.list_tree.side_effect = RuntimeError("truncated")
+    engine = AuditEngine(connector=mock_connector, use_blob_api=True)
+
+    audit = engine.audit_commit("test-owner/test-repo", sample_commit)
+
+    mock_connector.clone_repository.assert_called_once()
+    assert len(audit.files) == 4
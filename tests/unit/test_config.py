@@ -0,0 +1,50 @@
+"""Tests for configuration loading."""
+
+import dataclasses
+
+import pytest
+
+from src.config import MemoryConfig, clear_config_cache, load_config
+
+
+@pytest.fixture(autouse=True)
+def fresh_config():
+    """Isolate the load_config cache per test."""
+    clear_config_cache()
+    yield
+    clear_config_cache()
+
+
+def test_load_config_cached(tmp_path, monkeypatch):
+    """Test repeated loads return the cached configuration."""
+    monkeypatch.setenv("GITHUB_TOKEN", "tok")
+    env_file = str(tmp_path / ".env")
+
+    first = load_config(env_file)
+
+    assert load_config(env_file) is first
+    assert first.github.token == "tok"
+
+
+def test_clear_config_cache_rereads_environment(tmp_path, monkeypatch):
+    """Test clearing the cache picks up environment changes."""
+    env_file = str(tmp_path / ".env")
+    monkeypatch.setenv("LOG_LEVEL", "INFO")
+    assert load_config(env_file).log_level == "INFO"
+
+    monkeypatch.setenv("LOG_LEVEL", "DEBUG")
+    assert load_config(env_file).log_level == "INFO"
+
+    clear_config_cache()
+    assert load_config(env_file).log_level == "DEBUG"
+
+
+def test_config_is_frozen(tmp_path, monkeypatch):
+    """Test cached configs are immutable dataclasses."""
+    monkeypatch.setenv("SESSION_TIMEOUT", "120")
+    config = load_config(str(tmp_path / ".env"))
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.log_level = "DEBUG"
+
+    assert config.memory == MemoryConfig(enabled=True, session_timeout=120)
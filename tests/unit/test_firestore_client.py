@@ -4,11 +4,13 @@ import pytest
 from unittest.mock import Mock, MagicMock, patch
 from datetime import datetime
 
+from google.api_core.exceptions import Conflict
+
 import sys
 sys.path.insert(0, 'src')
 
-from storage.firestore_client import FirestoreAuditDB
-from audit_models import CommitAudit
+from storage.firestore_client import FirestoreAuditDB, get_audit_db
+from audit_models import CommitAudit, FileAudit
 
 
 @pytest.fixture
@@ -85,22 +87,27 @@ def test_store_commit_audit_new_repo(mock_firestore_client, sample_commit_audit)
     
     mock_collection.document.return_value = mock_repo_doc_ref
     mock_firestore_client.collection.return_value = mock_collection
+    mock_batch = mock_firestore_client.batch.return_value
     
     # Execute
     db = FirestoreAuditDB()
     db.store_commit_audit(sample_commit_audit)
     
-    # Verify repository document was created
-    mock_repo_doc_ref.set.assert_called_once()
-    repo_data = mock_repo_doc_ref.set.call_args[0][0]
-    assert repo_data["name"] == "facebook/react"
-    assert repo_data["total_commits"] == 1
-    
-    # Verify commit was stored
-    mock_commit_ref.set.assert_called_once()
-    commit_data = mock_commit_ref.set.call_args[0][0]
+    # Commit created (no read) and repository upserted in one batch
+    mock_commit_ref.get.assert_not_called()
+    mock_batch.create.assert_called_once()
+    commit_ref, commit_data = mock_batch.create.call_args[0]
+    assert commit_ref is mock_commit_ref
     assert commit_data["commit_sha"] == "abc123def456"
     assert commit_data["repository"] == "facebook/react"
+    
+    repo_ref, repo_data = mock_batch.set.call_args[0]
+    assert repo_ref is mock_repo_doc_ref
+    assert mock_batch.set.call_args.kwargs == {"merge": True}
+    assert repo_data["name"] == "facebook/react"
+    assert "first_analyzed" in repo_data
+    assert "total_commits" in repo_data
+    mock_batch.commit.assert_called_once()
 
 
 def test_store_commit_audit_existing_repo(mock_firestore_client, sample_commit_audit):
@@ -119,22 +126,165 @@ def test_store_commit_audit_existing_repo(mock_firestore_client, sample_commit_a
     
     mock_collection.document.return_value = mock_repo_doc_ref
     mock_firestore_client.collection.return_value = mock_collection
+    mock_batch = mock_firestore_client.batch.return_value
     
     # Execute
     db = FirestoreAuditDB()
     db.store_commit_audit(sample_commit_audit)
+    sample_commit_audit = sample_commit_audit.model_copy(update={"commit_sha": "fff999"})
+    db.store_commit_audit(sample_commit_audit)
+    
+    # Existing repository keeps first_analyzed, and is only read once
+    mock_repo_doc_ref.get.assert_called_once()
+    for call in mock_batch.set.call_args_list:
+        assert "first_analyzed" not in call[0][1]
+    assert mock_batch.commit.call_count == 2
+
+
+def test_store_commit_audit_existing_commit(mock_firestore_client, sample_commit_audit):
+    """Test re-storing a commit overwrites it without counting it again."""
+    mock_repo_doc_ref = MagicMock()
+    mock_repo_doc_ref.get.return_value.exists = True
+    mock_commit_ref = mock_repo_doc_ref.collection.return_value.document.return_value
+    mock_firestore_client.collection.return_value.document.return_value = mock_repo_doc_ref
+    
+    first_batch, retry_batch = MagicMock(), MagicMock()
+    first_batch.commit.side_effect = Conflict("exists")
+    mock_firestore_client.batch.side_effect = [first_batch, retry_batch]
+    
+    db = FirestoreAuditDB()
+    db.store_commit_audit(sample_commit_audit)
+    
+    retry_batch.create.assert_not_called()
+    commit_call, repo_call = retry_batch.set.call_args_list
+    assert commit_call[0][0] is mock_commit_ref
+    assert "total_commits" not in repo_call[0][1]
+    retry_batch.commit.assert_called_once()
+
+
+class FakeBulkWriter:
+    """BulkWriter stand-in that reports results/errors on flush."""
+    
+    def __init__(self, existing_paths):
+        self.existing_paths = existing_paths
+        self.pending = []
+        self.sets = []
+        self.on_result = self.on_error = None
+        self.closed = False
+    
+    def on_write_result(self, callback):
+        self.on_result = callback
+    
+    def on_write_error(self, callback):
+        self.on_error = callback
+    
+    def create(self, reference, data):
+        self.pending.append((reference, data))
+    
+    def set(self, reference, data, merge=False):
+        self.sets.append((reference, data, merge))
+    
+    def flush(self):
+        for reference, data in self.pending:
+            if reference.path in self.existing_paths:
+                operation = Mock(reference=reference, document_data=data, attempts=1)
+                assert self.on_error(Mock(code=6, operation=operation, attempts=1), self) is False
+            else:
+                self.on_result(reference, Mock(), self)
+        self.pending = []
+    
+    def close(self):
+        self.closed = True
+
+
+def test_store_commit_audits_bulk(mock_firestore_client, sample_commit_audit):
+    """Test bulk store counts only new commits, once per repository."""
+    docs = {}
+    
+    def document_ref(path):
+        ref = MagicMock()
+        ref.path = path
+        ref.id = path.rsplit("/", 1)[-1]
+        ref.get.return_value.exists = False
+        ref.collection.side_effect = lambda name: collection_ref(f"{path}/{name}", ref)
+        return docs.setdefault(path, ref)
+    
+    def collection_ref(path, parent=None):
+        coll = MagicMock()
+        coll.id = path.rsplit("/", 1)[-1]
+        
+        def document(doc_id):
+            ref = document_ref(f"{path}/{doc_id}")
+            ref.parent = coll
+            return ref
+        
+        coll.document.side_effect = document
+        coll.parent = parent
+        return coll
+    
+    mock_firestore_client.collection.side_effect = collection_ref
+    writer = FakeBulkWriter(
+        existing_paths={"quality-guardian-repositories/facebook_react/commits/old1"}
+    )
+    mock_firestore_client.bulk_writer.return_value = writer
+    
+    audits = [
+        sample_commit_audit.model_copy(update={"commit_sha": sha})
+        for sha in ("new1", "old1", "new2")
+    ]
+    
+    db = FirestoreAuditDB()
+    created = db.store_commit_audits(audits)
+    
+    assert created == 2
+    assert writer.closed
+    # Existing commit overwritten, then one repository upsert
+    (overwrite_ref, overwrite_data, _), (repo_ref, repo_data, merge) = writer.sets
+    assert overwrite_ref.id == "old1"
+    assert overwrite_data["commit_sha"] == "old1"
+    assert repo_ref.id == "facebook_react"
+    assert merge is True
+    assert repo_data["name"] == "facebook/react"
+    assert repo_data["total_commits"].value == 2
+    assert "first_analyzed" in repo_data
+
+
+def test_commit_document_round_trips(sample_commit_audit):
+    """Test stored documents keep queryable fields and rebuild the same audit."""
+    audit = sample_commit_audit.model_copy(
+        update={
+            "files": [
+                FileAudit(file_path="src/auth.py", lines_of_code=40),
+                FileAudit(file_path="src/db.py", high_issues=1, total_issues=1),
+            ],
+            "security_issues": [{"severity": "high", "line": 3}],
+        }
+    )
     
-    # Verify repository document was updated
-    mock_repo_doc_ref.update.assert_called_once()
+    data = FirestoreAuditDB._commit_document(audit)
     
-    # Verify commit was stored
-    mock_commit_ref.set.assert_called_once()
+    # Commit-level fields stay queryable even at their defaults
+    assert data["quality_score"] == 92.3
+    assert data["processing_time"] == 0.0
+    assert data["date"] == audit.date
+    assert data["files_changed"] == ["src/auth.py", "src/db.py"]
+    assert "files" not in data
+    assert "security_issues" not in data
+    assert isinstance(data["body"], bytes)
+    assert FirestoreAuditDB._audit_from_document(data) == audit
+
+
+def test_audit_from_legacy_document(sample_commit_audit):
+    """Test documents stored as plain fields (no JSON body) still load."""
+    data = sample_commit_audit.model_dump()
+    
+    assert FirestoreAuditDB._audit_from_document(data) == sample_commit_audit
 
 
 def test_get_repositories_empty(mock_firestore_client):
     """Test get_repositories when no repositories exist."""
     mock_collection = MagicMock()
-    mock_collection.stream.return_value = []
+    mock_collection.select.return_value.stream.return_value = []
     mock_firestore_client.collection.return_value = mock_collection
     
     db = FirestoreAuditDB()
@@ -156,12 +306,13 @@ def test_get_repositories_multiple(mock_firestore_client):
     mock_doc3.to_dict.return_value = {"name": "apache/kafka"}
     
     mock_collection = MagicMock()
-    mock_collection.stream.return_value = [mock_doc1, mock_doc2, mock_doc3]
+    mock_collection.select.return_value.stream.return_value = [mock_doc1, mock_doc2, mock_doc3]
     mock_firestore_client.collection.return_value = mock_collection
     
     db = FirestoreAuditDB()
     repos = db.get_repositories()
     
+    mock_collection.select.assert_called_once_with(["name"])
     assert len(repos) == 3
     assert "facebook/react" in repos
     assert "google/guava" in repos
@@ -169,13 +320,12 @@ def test_get_repositories_multiple(mock_firestore_client):
     assert repos == sorted(repos)  # Should be sorted
 
 
-def test_query_by_repository_not_found(mock_firestore_client):
+def test_query_by_repository_not_found(mock_firestore_client, caplog):
     """Test query_by_repository when repository doesn't exist."""
     mock_collection = MagicMock()
     mock_repo_doc_ref = MagicMock()
-    mock_repo_doc = MagicMock()
-    mock_repo_doc.exists = False
-    mock_repo_doc_ref.get.return_value = mock_repo_doc
+    commits_ref = mock_repo_doc_ref.collection.return_value
+    commits_ref.order_by.return_value.stream.return_value = iter([])
     
     mock_collection.document.return_value = mock_repo_doc_ref
     mock_firestore_client.collection.return_value = mock_collection
@@ -184,6 +334,8 @@ def test_query_by_repository_not_found(mock_firestore_client):
     audits = db.query_by_repository("nonexistent/repo")
     
     assert audits == []
+    mock_repo_doc_ref.get.assert_not_called()  # no existence probe
+    assert "Repository not found: nonexistent/repo" in caplog.text
 
 
 def test_query_by_repository_with_results(mock_firestore_client, sample_commit_audit):
@@ -220,6 +372,71 @@ def test_query_by_repository_with_results(mock_firestore_client, sample_commit_a
     assert audits[0].repository == "facebook/react"
 
 
+def test_query_by_repository_server_side_filters(mock_firestore_client, sample_commit_audit):
+    """Test filters become Firestore where clauses ahead of ordering/limit."""
+    mock_repo_doc_ref = MagicMock()
+    mock_repo_doc_ref.get.return_value.exists = True
+    mock_firestore_client.collection.return_value.document.return_value = mock_repo_doc_ref
+    commits_ref = mock_repo_doc_ref.collection.return_value
+    filtered = commits_ref.where.return_value.where.return_value
+    ordered = filtered.order_by.return_value
+    ordered.limit.return_value.stream.return_value = []
+    
+    db = FirestoreAuditDB()
+    db.query_by_repository(
+        "facebook/react",
+        limit=5,
+        filters=[("author", "==", "John Doe"), ("critical_issues", ">", 0)],
+    )
+    
+    first = commits_ref.where.call_args.kwargs["filter"]
+    second = commits_ref.where.return_value.where.call_args.kwargs["filter"]
+    assert (first.field_path, first.op_string, first.value) == ("author", "==", "John Doe")
+    assert (second.field_path, second.op_string, second.value) == ("critical_issues", ">", 0)
+    ordered.limit.assert_called_once_with(5)
+
+
+def test_iter_by_repository_parses_lazily(mock_firestore_client, sample_commit_audit):
+    """Test iter_by_repository decodes documents only as they are consumed."""
+    mock_repo_doc_ref = MagicMock()
+    mock_firestore_client.collection.return_value.document.return_value = mock_repo_doc_ref
+    docs = [MagicMock(), MagicMock()]
+    for doc in docs:
+        doc.to_dict.return_value = sample_commit_audit.model_dump()
+    commits_ref = mock_repo_doc_ref.collection.return_value
+    commits_ref.order_by.return_value.stream.return_value = iter(docs)
+    
+    db = FirestoreAuditDB()
+    first = next(db.iter_by_repository("facebook/react"))
+    
+    assert first.commit_sha == "abc123def456"
+    docs[0].to_dict.assert_called_once()
+    docs[1].to_dict.assert_not_called()
+
+
+def test_query_with_filters_files_and_authors(mock_firestore_client, sample_commit_audit):
+    """Test client-side file and author filters."""
+    other = sample_commit_audit.model_copy(
+        update={"commit_sha": "fff000", "author": "Jane Roe", "files_changed": ["README.md"]}
+    )
+    mock_repo_doc_ref = MagicMock()
+    mock_repo_doc_ref.get.return_value.exists = True
+    mock_query = mock_repo_doc_ref.collection.return_value.order_by.return_value
+    mock_query.stream.return_value = [
+        Mock(to_dict=Mock(return_value=sample_commit_audit.model_dump())),
+        Mock(to_dict=Mock(return_value=other.model_dump())),
+    ]
+    mock_firestore_client.collection.return_value.document.return_value = mock_repo_doc_ref
+
+    db = FirestoreAuditDB()
+
+    by_file = db.query_with_filters("facebook/react", files=["src/db.py", "src/missing.py"])
+    assert [a.commit_sha for a in by_file] == ["abc123def456"]
+
+    by_author = db.query_with_filters("facebook/react", authors=["Jane Roe"])
+    assert [a.commit_sha for a in by_author] == ["fff000"]
+
+
 def test_get_repository_stats_found(mock_firestore_client):
     """Test get_repository_stats returns stats."""
     mock_collection = MagicMock()
@@ -275,23 +492,32 @@ def test_delete_repository_success(mock_firestore_client):
     mock_commits_collection = MagicMock()
     mock_commit_doc1 = MagicMock()
     mock_commit_doc2 = MagicMock()
-    mock_commits_collection.stream.return_value = [mock_commit_doc1, mock_commit_doc2]
+    mock_commits_collection.select.return_value.stream.return_value = [
+        mock_commit_doc1,
+        mock_commit_doc2,
+    ]
     mock_repo_doc_ref.collection.return_value = mock_commits_collection
     
     mock_collection.document.return_value = mock_repo_doc_ref
     mock_firestore_client.collection.return_value = mock_collection
     
-    # Mock batch
-    mock_batch = MagicMock()
-    mock_firestore_client.batch.return_value = mock_batch
+    # Mock bulk writer
+    mock_writer = MagicMock()
+    mock_firestore_client.bulk_writer.return_value = mock_writer
     
     # Execute
     db = FirestoreAuditDB()
     result = db.delete_repository("facebook/react")
     
     assert result is True
-    mock_repo_doc_ref.delete.assert_called_once()
-    assert mock_batch.delete.call_count == 2  # Two commits deleted
+    deleted = [c[0][0] for c in mock_writer.delete.call_args_list]
+    # Two commits, then the repository document
+    assert deleted == [
+        mock_commit_doc1.reference,
+        mock_commit_doc2.reference,
+        mock_repo_doc_ref,
+    ]
+    mock_writer.close.assert_called_once()
 
 
 def test_delete_repository_not_found(mock_firestore_client):
@@ -309,3 +535,14 @@ def test_delete_repository_not_found(mock_firestore_client):
     result = db.delete_repository("nonexistent/repo")
     
     assert result is False
+
+
+def test_get_audit_db_shared_per_settings(mock_firestore_client):
+    """Test tool calls reuse one FirestoreAuditDB per configuration."""
+    get_audit_db.cache_clear()
+    
+    first = get_audit_db(project_id="p1")
+    
+    assert get_audit_db(project_id="p1") is first
+    assert get_audit_db(project_id="p2") is not first
+    get_audit_db.cache_clear()
@@ -1,18 +1,21 @@
 """Unit tests for GitHub connector."""
 
 import os
-from datetime import datetime, timedelta
-from unittest.mock import Mock, patch
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
-from src.connectors.github import GitHubConnector
+from src.connectors.github import REPO_INFO_CACHE_SIZE, GitHubConnector
 
 
 @pytest.fixture
 def mock_github_client():
     """Mock PyGithub client."""
-    with patch("src.connectors.github.Github") as mock:
+    with patch("github.Github") as mock:
         yield mock
 
 
@@ -47,6 +50,46 @@ def test_get_repository_info(connector, mock_github_client):
     assert info.topics == ["testing", "quality"]
 
 
+def test_get_repository_info_cached(connector, mock_github_client):
+    """Test repeated lookups within the TTL reuse cached metadata."""
+    connector._client.get_repo.return_value = Mock(full_name="test-owner/test-repo")
+
+    first = connector.get_repository_info("test-owner/test-repo")
+    second = connector.get_repository_info("test-owner/test-repo")
+
+    assert second is first
+    connector._client.get_repo.assert_called_once()
+
+    with patch("src.connectors.github.time.monotonic", return_value=time.monotonic() + 3600):
+        connector.get_repository_info("test-owner/test-repo")
+    assert connector._client.get_repo.call_count == 2
+
+
+def test_repository_object_cached_across_calls(connector, mock_github_client):
+    """Test consecutive operations on one repository share a single lookup."""
+    mock_repo = Mock()
+    mock_repo.default_branch = "main"
+    mock_repo.get_commits.return_value = []
+    connector._client.get_repo.return_value = mock_repo
+
+    connector.list_commits("test-owner/test-repo")
+    connector.list_commits("test-owner/test-repo", branch="dev")
+
+    connector._client.get_repo.assert_called_once_with("test-owner/test-repo")
+
+
+def test_repository_cache_thread_safe(connector, mock_github_client):
+    """Test concurrent lookups with eviction keep the LRU consistent."""
+    connector._client.get_repo.side_effect = lambda name: Mock(full_name=name)
+    names = [f"owner/repo{i % (REPO_INFO_CACHE_SIZE * 2)}" for i in range(2000)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        repos = list(executor.map(connector._get_repository, names))
+
+    assert [r.full_name for r in repos] == names
+    assert len(connector._repo_cache) <= REPO_INFO_CACHE_SIZE
+
+
 def test_list_commits(connector, mock_github_client):
     """Test commit listing with date filtering."""
     mock_repo = Mock()
@@ -62,6 +105,7 @@ def test_list_commits(connector, mock_github_client):
     mock_commit1.stats.additions = 10
     mock_commit1.stats.deletions = 5
     mock_commit1.files = [Mock(filename="file1.py"), Mock(filename="file2.py")]
+    mock_commit1.parents = [Mock(sha="def456")]
 
     mock_commit2 = Mock()
     mock_commit2.sha = "def456"
@@ -72,6 +116,7 @@ def test_list_commits(connector, mock_github_client):
     mock_commit2.stats.additions = 20
     mock_commit2.stats.deletions = 2
     mock_commit2.files = [Mock(filename="file3.py")]
+    mock_commit2.parents = []
 
     mock_repo.get_commits.return_value = [mock_commit1, mock_commit2]
     connector._client.get_repo.return_value = mock_repo
@@ -85,6 +130,7 @@ def test_list_commits(connector, mock_github_client):
     assert commits[0].files_changed == ["file1.py", "file2.py"]
     assert commits[0].additions == 10
     assert commits[0].deletions == 5
+    assert commits[0].parents == ["def456"]
 
     assert commits[1].sha == "def456"
     assert commits[1].author == "Bob"
@@ -107,57 +153,150 @@ def test_list_commits_with_date_filter(connector, mock_github_client):
     )
 
 
-def test_list_tags(connector, mock_github_client):
-    """Test tag/release listing."""
+def test_iter_commits_is_lazy_and_skips_files(connector, mock_github_client):
+    """Test iter_commits stops early and skips per-commit detail fetches."""
     mock_repo = Mock()
+    mock_repo.default_branch = "main"
 
-    # Mock tag objects
-    mock_tag1 = Mock()
-    mock_tag1.name = "v2.0.0"
-    mock_tag1.commit.sha = "xyz789"
+    class ListingCommit:
+        """Listing payload whose files/stats would trigger a detail request."""
 
-    mock_tag2 = Mock()
-    mock_tag2.name = "v1.0.0"
-    mock_tag2.commit.sha = "uvw456"
+        def __init__(self, sha):
+            self.sha = sha
+            self.commit = Mock()
+            self.parents = []
 
-    mock_repo.get_tags.return_value = [mock_tag1, mock_tag2]
+        @property
+        def files(self):
+            raise AssertionError("files fetched")
 
-    # Mock commit details for dates
-    mock_commit1 = Mock()
-    mock_commit1.commit.author.date = datetime(2024, 11, 15)
-    mock_commit1.commit.message = "Release 2.0.0"
+        @property
+        def stats(self):
+            raise AssertionError("stats fetched")
 
-    mock_commit2 = Mock()
-    mock_commit2.commit.author.date = datetime(2024, 10, 1)
-    mock_commit2.commit.message = "Release 1.0.0"
+    consumed = []
+
+    def get_commits(**kwargs):
+        for sha in ["c3", "c2", "c1"]:
+            consumed.append(sha)
+            yield ListingCommit(sha)
+
+    mock_repo.get_commits.side_effect = get_commits
+    connector._client.get_repo.return_value = mock_repo
+
+    commits = connector.iter_commits("test-owner/test-repo", include_files=False)
+    first = next(commits)
 
-    mock_repo.get_commit.side_effect = [mock_commit1, mock_commit2]
+    assert first.sha == "c3"
+    assert first.files_changed == []
+    assert first.additions == 0
+    assert consumed == ["c3"]
+
+
+def test_iter_commits_details_keep_listing_order(connector, mock_github_client):
+    """Test concurrently fetched commit details are yielded newest first."""
+    mock_repo = Mock()
+    mock_repo.default_branch = "main"
+    listing = []
+    for i in range(20):
+        commit = Mock()
+        commit.sha = f"c{i}"
+        commit.files = [Mock(filename=f"f{i}.py")]
+        commit.parents = []
+        listing.append(commit)
+    mock_repo.get_commits.return_value = listing
     connector._client.get_repo.return_value = mock_repo
 
+    commits = list(connector.iter_commits("test-owner/test-repo"))
+
+    assert [c.sha for c in commits] == [f"c{i}" for i in range(20)]
+    assert commits[7].files_changed == ["f7.py"]
+
+
+def test_list_tags(connector, mock_github_client):
+    """Test tag/release listing via paginated GraphQL."""
+    connector._session = MagicMock()
+    page1 = {
+        "data": {
+            "repository": {
+                "refs": {
+                    "pageInfo": {"hasNextPage": True, "endCursor": "c1"},
+                    "nodes": [
+                        {
+                            "name": "v1.0.0",
+                            "target": {
+                                "__typename": "Commit",
+                                "oid": "uvw456",
+                                "message": "Release 1.0.0",
+                                "author": {"date": "2024-10-01T00:00:00Z"},
+                            },
+                        }
+                    ],
+                }
+            }
+        }
+    }
+    page2 = {
+        "data": {
+            "repository": {
+                "refs": {
+                    "pageInfo": {"hasNextPage": False, "endCursor": None},
+                    "nodes": [
+                        {
+                            "name": "v2.0.0",
+                            "target": {
+                                "__typename": "Tag",
+                                "target": {
+                                    "oid": "xyz789",
+                                    "message": "Release 2.0.0",
+                                    "author": {"date": "2024-11-15T00:00:00Z"},
+                                },
+                            },
+                        }
+                    ],
+                }
+            }
+        }
+    }
+    connector._session.post.return_value.json.side_effect = [page1, page2]
+
     tags = connector.list_tags("test-owner/test-repo")
 
     assert len(tags) == 2
     # Should be sorted newest first
     assert tags[0].name == "v2.0.0"
-    assert tags[0].sha == "xyz789"
-    assert tags[0].date == datetime(2024, 11, 15)
+    assert tags[0].sha == "xyz789"  # Annotated tag peeled to its commit
+    assert tags[0].date == datetime(2024, 11, 15, tzinfo=timezone.utc)
     assert tags[0].message == "Release 2.0.0"
 
     assert tags[1].name == "v1.0.0"
-    assert tags[1].date == datetime(2024, 10, 1)
+    assert tags[1].date == datetime(2024, 10, 1, tzinfo=timezone.utc)
+
+    assert connector._session.post.call_count == 2
+    second_vars = connector._session.post.call_args_list[1].kwargs["json"]["variables"]
+    assert second_vars == {"owner": "test-owner", "name": "test-repo", "cursor": "c1"}
+    connector._client.get_repo.assert_not_called()
 
 
-@patch("src.connectors.github.requests")
-def test_get_commit_diff(mock_requests, connector, mock_github_client):
-    """Test commit diff retrieval."""
+def test_get_commit_diff(connector, mock_github_client):
+    """Test commit diff retrieval over the shared session."""
     mock_response = Mock()
     mock_response.text = "diff --git a/file.py b/file.py\n..."
-    mock_requests.get.return_value = mock_response
+    connector._session = MagicMock()
+    connector._session.get.return_value = mock_response
 
     diff = connector.get_commit_diff("test-owner/test-repo", "abc123")
 
     assert diff == "diff --git a/file.py b/file.py\n..."
     mock_response.raise_for_status.assert_called_once()
+    assert connector._session.get.call_args.kwargs["headers"] == {
+        "Accept": "application/vnd.github.v3.diff"
+    }
+
+
+def test_session_carries_token(connector):
+    """Test the shared session authenticates with the connector token."""
+    assert connector._session.headers["Authorization"] == "token test_token"
 
 
 @patch("src.connectors.github.subprocess")
@@ -177,6 +316,9 @@ def test_clone_repository(mock_path, mock_subprocess, connector, mock_github_cli
     assert path == "/tmp/test-repo"
     mock_target.mkdir.assert_called_once_with(parents=True, exist_ok=True)
     assert mock_subprocess.run.call_count == 1  # Only clone, no checkout
+    clone_args = mock_subprocess.run.call_args[0][0]
+    assert clone_args[:2] == ["git", "clone"]
+    assert "--depth" in clone_args
 
 
 @patch("src.connectors.github.subprocess")
@@ -198,4 +340,130 @@ def test_clone_repository_with_sha(
     )
 
     assert path == "/tmp/test-repo"
-    assert mock_subprocess.run.call_count == 2  # Clone + checkout
+    commands = [c[0][0][:2] for c in mock_subprocess.run.call_args_list]
+    assert commands == [
+        ["git", "init"],
+        ["git", "remote"],
+        ["git", "fetch"],
+        ["git", "checkout"],
+    ]
+    fetch_args = mock_subprocess.run.call_args_list[2][0][0]
+    assert fetch_args[-1] == "abc123"
+    assert "--depth" in fetch_args
+
+
+@patch("src.connectors.github.shutil")
+@patch("src.connectors.github.subprocess.run")
+@patch("src.connectors.github.Path")
+def test_clone_repository_with_sha_fallback(
+    mock_path, mock_run, mock_shutil, connector, mock_github_client
+):
+    """Test full clone + checkout when fetching a single SHA is refused."""
+    mock_repo = Mock()
+    mock_repo.clone_url = "https://github.com/test-owner/test-repo.git"
+    connector._client.get_repo.return_value = mock_repo
+
+    mock_target = MagicMock()
+    mock_target.absolute.return_value = "/tmp/test-repo"
+    mock_path.return_value = mock_target
+    mock_run.side_effect = [
+        None,
+        None,
+        subprocess.CalledProcessError(128, ["git", "fetch"]),
+        None,
+        None,
+    ]
+
+    path = connector.clone_repository(
+        "test-owner/test-repo", "/tmp/test-repo", sha="abc123"
+    )
+
+    assert path == "/tmp/test-repo"
+    commands = [c[0][0][:2] for c in mock_run.call_args_list]
+    assert commands == [
+        ["git", "init"],
+        ["git", "remote"],
+        ["git", "fetch"],
+        ["git", "clone"],
+        ["git", "checkout"],
+    ]
+    assert "--filter=blob:none" in mock_run.call_args_list[3][0][0]
+    assert mock_run.call_args_list[3].kwargs["env"]["GIT_TERMINAL_PROMPT"] == "0"
+    mock_shutil.rmtree.assert_called_once()
+
+
+@patch("src.connectors.github.subprocess.run")
+def test_checkout_commit_fetches_missing_sha(mock_run, connector):
+    """Test checkout falls back to a depth-1 fetch for commits not yet local."""
+    mock_run.side_effect = [subprocess.CalledProcessError(1, ["git", "checkout"]), None, None]
+
+    connector.checkout_commit("/tmp/test-repo", "def456")
+
+    commands = [c[0][0][1] for c in mock_run.call_args_list]
+    assert commands == ["checkout", "fetch", "checkout"]
+    assert mock_run.call_args_list[1][0][0][-2:] == ["origin", "def456"]
+
+
+@patch("src.connectors.github.subprocess.run")
+def test_changed_files_fetches_missing_commit(mock_run, connector):
+    """Test changed_files fetches a commit absent from the clone, then diffs."""
+    mock_run.side_effect = [
+        None,
+        subprocess.CalledProcessError(1, ["git", "cat-file"]),
+        None,
+        Mock(stdout="b.py\0src/c.py\0"),
+    ]
+
+    changed = connector.changed_files("/tmp/test-repo", "abc123", "def456")
+
+    assert changed == ["b.py", "src/c.py"]
+    fetch_args = mock_run.call_args_list[2][0][0]
+    assert fetch_args[:2] == ["git", "fetch"] and fetch_args[-1] == "def456"
+    diff_args = mock_run.call_args_list[3][0][0]
+    assert diff_args[:2] == ["git", "diff"] and diff_args[-2:] == ["abc123", "def456"]
+
+
+def test_list_tree(connector, mock_github_client):
+    """Test recursive tree listing returns file blobs only (no trees, no symlinks)."""
+    mock_tree = Mock()
+    mock_tree.truncated = False
+    mock_tree.tree = [
+        Mock(path="app", sha="t1", size=None, type="tree"),
+        Mock(path="app/main.py", sha="b1", size=120, type="blob"),
+        Mock(path="README.md", sha="b2", size=40, type="blob"),
+        Mock(path="link.py", sha="b3", size=9, type="blob", mode="120000"),
+    ]
+    mock_repo = Mock()
+    mock_repo.get_git_tree.return_value = mock_tree
+    connector._client.get_repo.return_value = mock_repo
+
+    entries = connector.list_tree("test-owner/test-repo", "abc123")
+
+    mock_repo.get_git_tree.assert_called_once_with("abc123", recursive=True)
+    assert [e.path for e in entries] == ["app/main.py", "README.md"]
+    assert entries[0].sha == "b1"
+    assert entries[0].size == 120
+
+
+def test_list_tree_truncated(connector, mock_github_client):
+    """Test truncated trees raise so callers can fall back to cloning."""
+    mock_tree = Mock()
+    mock_tree.truncated = True
+    mock_repo = Mock()
+    mock_repo.get_git_tree.return_value = mock_tree
+    connector._client.get_repo.return_value = mock_repo
+
+    with pytest.raises(RuntimeError):
+        connector.list_tree("test-owner/test-repo", "abc123")
+
+
+def test_get_blob(connector, mock_github_client):
+    """Test blob content is base64-decoded."""
+    mock_blob = Mock()
+    mock_blob.encoding = "base64"
+    mock_blob.content = "cHJpbnQoMSkK"  # print(1)\n
+    mock_repo = Mock()
+    mock_repo.get_git_blob.return_value = mock_blob
+    connector._client.get_repo.return_value = mock_repo
+
+    assert connector.get_blob("test-owner/test-repo", "b1") == b"print(1)\n"
@@ -0,0 +1,46 @@
+"""Tests for query tool helpers."""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from src.tools.query_tools import _select_audit_sample
+
+
+def _commits(dates):
+    """Build commit stubs newest first, as Firestore returns them."""
+    ordered = sorted(dates, reverse=True)
+    return [SimpleNamespace(commit_sha=f"sha{i}", date=d) for i, d in enumerate(ordered)]
+
+
+def test_select_audit_sample_takes_last_commit_before_each_point():
+    """Test sampling picks the newest commit at or before each time point."""
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    # Dense burst early, sparse afterwards
+    dates = [base + timedelta(hours=h) for h in range(30)]
+    dates += [base + timedelta(days=d) for d in (10, 20, 30)]
+    commits = _commits(dates)
+
+    sample = _select_audit_sample(commits, max_points=4)
+
+    assert [c.date for c in sample] == [
+        base,
+        base + timedelta(days=10),
+        base + timedelta(days=20),
+        base + timedelta(days=30),
+    ]
+
+
+def test_select_audit_sample_baseline_before_start_date():
+    """Test points before the first commit are skipped, then forward-filled."""
+    base = datetime(2025, 3, 1, tzinfo=timezone.utc)
+    commits = _commits([base + timedelta(days=d) for d in range(25)])
+
+    sample = _select_audit_sample(
+        commits, start_date_str="2025-02-01", end_date_str="2025-03-25", max_points=20
+    )
+
+    dates = [c.date for c in sample]
+    assert dates == sorted(dates)
+    assert len(set(c.commit_sha for c in sample)) == len(sample)
+    assert dates[0] >= base
+    assert dates[-1] == base + timedelta(days=24)